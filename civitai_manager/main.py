@@ -128,10 +128,11 @@ def get_config():
 def start_web_server(host='0.0.0.0', port=5000, debug=False):
     """Start the web interface."""
     try:
-        from civitai_manager.web_app import app
+        from civitai_manager.web_app import enable_queued_logging, run_server
+        enable_queued_logging()
         print(f"Starting web interface on http://{host}:{port}")
         print("Press Ctrl+C to stop the server")
-        app.run(host=host, port=port, debug=debug)
+        run_server(host=host, port=port, debug=debug)
     except ImportError as e:
         print(f"Error importing web application: {e}")
         print("Make sure all web dependencies are installed:")
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .file_processor import process_single_file
 
@@ -29,11 +31,19 @@ class ProcessingMetrics:
         return self.processed_files / self.elapsed_time
 
 class BatchProcessor:
-    def __init__(self, max_workers: int = 4, download_all_images: bool = False, skip_images: bool = False, html_only: bool = False, only_update: bool = False, user_images_level: str = 'ALL', user_posts_limit: int = 0, images_per_post_limit: int = 0):
+    def __init__(self, max_workers: int = 4, download_all_images: bool = False, skip_images: bool = False, html_only: bool = False, only_update: bool = False, user_images_level: str = 'ALL', user_posts_limit: int = 0, images_per_post_limit: int = 0, cancel_event: Optional[threading.Event] = None):
         self.max_workers = max_workers
         self.metrics = ProcessingMetrics()
         self.session = requests.Session()  # Reuse HTTP session
-        self._cancel = threading.Event()
+        # One pooled connection per worker so threads don't drop keep-alives;
+        # rate limits and transient 5xx are retried with backoff before the
+        # callers see the final status code
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # An external event (e.g. the web UI's cancel flag) stops queued files
+        self._cancel = cancel_event if cancel_event is not None else threading.Event()
         self.download_all_images = download_all_images
         self.skip_images = skip_images
         self.html_only = html_only
@@ -55,7 +65,7 @@ class BatchProcessor:
                     break
                 futures.append(
                     executor.submit(
-                        process_single_file,
+                        self._process_file,
                         file,
                         output_dir,
                         self.download_all_images,
@@ -69,11 +79,16 @@ class BatchProcessor:
                     )
                 )
             
+            # Files never submitted because of a cancel count as skipped
+            self.metrics.skipped_files += len(files) - len(futures)
+
             # Wait for all tasks to complete
             for future in futures:
                 try:
                     result = future.result()
-                    if result:
+                    if result is None:
+                        self.metrics.skipped_files += 1
+                    elif result:
                         self.metrics.processed_files += 1
                     else:
                         self.metrics.failed_files += 1
@@ -83,6 +98,16 @@ class BatchProcessor:
                     
         return self.metrics
             
+    def _process_file(self, file: Path, *args) -> Optional[bool]:
+        """Run process_single_file unless the batch was cancelled.
+
+        All files are queued up front, so cancelling has to be checked when
+        a worker picks a file up; returns None for files skipped that way.
+        """
+        if self._cancel.is_set():
+            return None
+        return process_single_file(file, *args)
+
     def cancel(self):
         """Cancel ongoing processing"""
         self._cancel.set()
@@ -7,12 +7,11 @@ from datetime import datetime
 import time
 import random
 import logging
-import hashlib
 from typing import Optional, Dict, List, Tuple, DefaultDict
 
 import requests
 
-from ..utils.string_utils import sanitize_filename, calculate_sha256
+from ..utils.string_utils import cached_sha256, load_json_file, sanitize_filename
 from ..utils.html_generators.model_page import generate_html_summary
 from ..utils.config import SUPPORTED_FILE_EXTENSIONS
 
@@ -45,10 +44,11 @@ def extract_metadata(file_path: Path, output_dir: Path) -> bool:
             return False
         if file_path.suffix not in SUPPORTED_FILE_EXTENSIONS:
             return False
+        st = file_path.stat()
         meta = {
             'filename': file_path.name,
-            'size_bytes': file_path.stat().st_size,
-            'modified_at': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+            'size_bytes': st.st_size,
+            'modified_at': datetime.fromtimestamp(st.st_mtime).isoformat(),
         }
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -64,17 +64,15 @@ def extract_hash(file_path: Path, output_dir: Path) -> Optional[str]:
     try:
         if not file_path.exists():
             return None
-        h = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                if not chunk:
-                    break
-                h.update(chunk)
-        value = h.hexdigest()
+        value = cached_sha256(file_path)
+        if value is None:
+            return None
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+        # A hex digest needs no escaping, so format the fixed-shape record
+        # directly; the bytes match json.dump(..., indent=4)
         with open(output_dir / f"{file_path.stem}_hash.json", 'w', encoding='utf-8') as f:
-            json.dump({'hash_value': value, 'algorithm': 'SHA256'}, f, indent=4)
+            f.write(f'{{\n    "hash_value": "{value}",\n    "algorithm": "SHA256"\n}}')
         return value
     except Exception as e:
         print(f"Error extracting hash: {e}")
@@ -729,7 +727,7 @@ def fetch_model_details(
         print(f"Error fetching model details: {str(e)}")
         return False
 
-def check_for_updates(safetensors_path, output_dir, hash_value):
+def check_for_updates(safetensors_path, output_dir, hash_value, session=None):
     """
     Check if the model needs to be updated by comparing updatedAt timestamps
     
@@ -737,6 +735,7 @@ def check_for_updates(safetensors_path, output_dir, hash_value):
         safetensors_path (Path): Path to the safetensors file
         output_dir (Path): Directory where files are saved
         hash_value (str): SHA256 hash of the safetensors file
+        session (requests.Session): Optional requests session for HTTP calls
         
     Returns:
         bool: True if update is needed, False if files are up to date
@@ -749,11 +748,10 @@ def check_for_updates(safetensors_path, output_dir, hash_value):
             
         # Read existing version data
         try:
-            with open(civitai_version_file, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-                existing_updated_at = existing_data.get('updatedAt')
-                if not existing_updated_at:
-                    return True
+            existing_data = load_json_file(civitai_version_file)
+            existing_updated_at = existing_data.get('updatedAt')
+            if not existing_updated_at:
+                return True
         except (json.JSONDecodeError, KeyError):
             return True
             
@@ -762,7 +760,7 @@ def check_for_updates(safetensors_path, output_dir, hash_value):
         print("\nChecking for updates from Civitai API:")
         print(civitai_url)
         
-        response = requests.get(civitai_url)
+        response = (session or requests).get(civitai_url)
         if response.status_code != 200:
             print(f"Error checking for updates (Status code: {response.status_code})")
             return True
@@ -850,11 +848,10 @@ def process_single_file(
             
         # Read existing hash
         try:
-            with open(hash_file, 'r') as f:
-                hash_data = json.load(f)
-                hash_value = hash_data.get('hash_value')
-                if not hash_value:
-                    raise ValueError("Invalid hash file")
+            hash_data = load_json_file(hash_file)
+            hash_value = hash_data.get('hash_value')
+            if not hash_value:
+                raise ValueError("Invalid hash file")
         except Exception:
             return False
     else:
@@ -862,7 +859,7 @@ def process_single_file(
         if not hash_value:
             return False
     
-    if not check_for_updates(file_path, model_output_dir, hash_value):
+    if not check_for_updates(file_path, model_output_dir, hash_value, session=session):
         return True
     
     metadata_extracted = False
@@ -884,9 +881,8 @@ def process_single_file(
                     model_version_id = None
                     try:
                         if version_json_path.exists():
-                            with open(version_json_path, 'r', encoding='utf-8') as vf:
-                                vdata = json.load(vf)
-                                model_version_id = vdata.get('id')
+                            vdata = load_json_file(version_json_path)
+                            model_version_id = vdata.get('id')
                     except Exception:
                         model_version_id = None
                     fetch_user_posts(
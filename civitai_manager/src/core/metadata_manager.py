@@ -15,8 +15,8 @@ from .batch_processor import BatchProcessor
 from .file_processor import process_single_file
 
 
-from ..utils.file_tracker import ProcessedFilesManager
-from ..utils.string_utils import sanitize_filename, calculate_sha256
+from ..utils.file_tracker import ProcessedFilesManager, iter_model_files
+from ..utils.string_utils import sanitize_filename, calculate_sha256, load_json_file
 from ..utils.html_generators.model_page import generate_html_summary
 
 # Configure logging
@@ -37,13 +37,7 @@ def find_safetensors_files(directory_path):
 
     Kept function name for backward compatibility.
     """
-    model_files = []
-    exts = ('.safetensors', '.ckpt', '.pt', '.pth', '.bin')
-    for root, dirs, files in os.walk(directory_path, followlinks=True):
-        for file in files:
-            if file.lower().endswith(exts):
-                model_files.append(Path(root) / file)
-    return model_files
+    return [Path(p) for p in iter_model_files(directory_path)]
 
 def get_output_path(clean=False):
     """
@@ -96,8 +90,7 @@ def generate_image_json_files(base_output_path):
     
     for version_file in version_files:
         try:
-            with open(version_file, 'r', encoding='utf-8') as f:
-                version_data = json.load(f)
+            version_data = load_json_file(version_file)
             
             model_dir = version_file.parent
             
@@ -132,6 +125,11 @@ def find_duplicate_models(directory_path, base_output_path):
         dict: Dictionary mapping hashes to lists of model info
     """
     hash_map = {}
+
+    # Walk the input directory once; the first file found per name wins
+    model_files_by_stem = {}
+    for file in find_safetensors_files(directory_path):
+        model_files_by_stem.setdefault(file.stem, file)
     
     # Scan all processed models
     for model_dir in base_output_path.iterdir():
@@ -143,30 +141,25 @@ def find_duplicate_models(directory_path, base_output_path):
             continue
             
         try:
-            with open(hash_file, 'r', encoding='utf-8') as f:
-                hash_data = json.load(f)
-                hash_value = hash_data.get('hash_value')
-                if not hash_value:
-                    continue
-                    
-                # Find corresponding safetensors file
-                safetensors_file = None
-                for file in find_safetensors_files(directory_path):
-                    if file.stem == model_dir.name:
-                        safetensors_file = file
-                        break
+            hash_data = load_json_file(hash_file)
+            hash_value = hash_data.get('hash_value')
+            if not hash_value:
+                continue
                 
-                if not safetensors_file:
-                    continue
-                    
-                if hash_value not in hash_map:
-                    hash_map[hash_value] = []
-                    
-                hash_map[hash_value].append({
-                    'model_dir': model_dir,
-                    'safetensors_file': safetensors_file,
-                    'processed_time': hash_data.get('timestamp')
-                })
+            # Find corresponding safetensors file
+            safetensors_file = model_files_by_stem.get(model_dir.name)
+            
+            if not safetensors_file:
+                continue
+                
+            if hash_value not in hash_map:
+                hash_map[hash_value] = []
+                
+            hash_map[hash_value].append({
+                'model_dir': model_dir,
+                'safetensors_file': safetensors_file,
+                'processed_time': hash_data.get('timestamp')
+            })
                 
         except Exception as e:
             print(f"Error reading hash file {hash_file}: {e}")
@@ -306,6 +299,7 @@ def process_directory(
         user_images_level=user_images_level,
     user_posts_limit=user_posts_limit,
     images_per_post_limit=images_per_post_limit,
+    cancel_event=cancel_flag,
     )
     metrics = None
 
@@ -372,8 +366,7 @@ def process_directory(
         
         # Update processed files tracking
         if not (html_only or only_update):
-            for file_path in safetensors_files[:metrics.processed_files]:
-                files_manager.add_processed_file(file_path)
+            files_manager.add_processed_files(safetensors_files[:metrics.processed_files])
             files_manager.save_processed_files()
             
         # Log final statistics
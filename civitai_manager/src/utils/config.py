@@ -14,6 +14,11 @@ SUPPORTED_FILE_EXTENSIONS = [
     ".yaml"  # For ComfyUI workflows, though metadata extraction might differ
 ]
 
+# Suffixes of the model files the directory scanners and uploads pick up (lower
+# case, for str.endswith). The workflow formats are left out: scanning for
+# .json/.yaml would also match the metadata files the archive writes itself.
+MODEL_FILE_EXTENSIONS = tuple(ext for ext in SUPPORTED_FILE_EXTENSIONS if ext not in (".json", ".yaml"))
+
 class ConfigValidationError(Exception):
     pass
 
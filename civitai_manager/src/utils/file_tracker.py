@@ -4,42 +4,112 @@ import os
 from datetime import datetime
 import shutil
 
+from civitai_manager.src.utils.config import MODEL_FILE_EXTENSIONS
+
+try:
+    import ijson
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+def _norm(path):
+    """Normalize a str or Path into the key used for tracker entries"""
+    return os.path.normcase(os.path.normpath(os.fspath(path)))
+
+def iter_files(root, match, follow_symlinks=True):
+    """Yield the paths of files below root whose name satisfies match(name).
+
+    Walks with os.scandir so file/dir checks use the directory entry's
+    cached type. With follow_symlinks, symlinked directories are followed
+    like os.walk(followlinks=True), each target once so link cycles end.
+    Broken symlinks are skipped.
+    """
+    stack = [os.fspath(root)]
+    seen_links = set()
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if entry.is_symlink():
+                            st = entry.stat()
+                            if (st.st_dev, st.st_ino) in seen_links:
+                                continue
+                            seen_links.add((st.st_dev, st.st_ino))
+                        stack.append(entry.path)
+                    elif match(entry.name) and entry.is_file(follow_symlinks=follow_symlinks):
+                        yield entry.path
+                except OSError:
+                    continue
+
+def iter_model_files(root, follow_symlinks=True):
+    """Yield the paths of model files below root (see iter_files)"""
+    return iter_files(root, lambda name: name.lower().endswith(MODEL_FILE_EXTENSIONS),
+                      follow_symlinks)
+
+# Trackers larger than this are parsed incrementally when ijson is available
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+
 class ProcessedFilesManager:
     def __init__(self, output_dir):
         self.output_dir = Path(output_dir)
         self.processed_file = self.output_dir / 'processed_files.json'
         self.processed_files = self._load_processed_files()
         self.cleanup_threshold = 1000  # Maximum number of entries before cleanup
+        self.backup_count = 5
+        self._legacy_backups_checked = False
 
     def _load_processed_files(self):
         """Load the list of processed files from JSON"""
-        if self.processed_file.exists():
-            try:
-                with open(self.processed_file, 'r') as f:
-                    data = json.load(f)
-                    # Convert old format to new format if necessary
-                    if isinstance(data, dict) and 'files' in data:
-                        files = []
-                        for f in data['files']:
-                            if isinstance(f, dict):
-                                # Already in new format
-                                path = f['path']
-                            else:
-                                # Old format - just a path string
-                                path = f
-                            files.append({
-                                'path': path,
-                                'last_seen': datetime.now().isoformat(),
-                                'still_exists': os.path.exists(path)
-                            })
-                        return {
-                            'files': files,
-                            'last_update': data.get('last_update', datetime.now().isoformat())
-                        }
-                    return data
-            except (FileNotFoundError, json.JSONDecodeError):
-                return {'files': [], 'last_update': None}
-        return {'files': [], 'last_update': None}
+        try:
+            size = self.processed_file.stat().st_size
+        except FileNotFoundError:
+            return {'files': [], 'last_update': None}
+        try:
+            if ijson is not None and size > STREAM_THRESHOLD_BYTES:
+                return self._stream_processed_files()
+            with open(self.processed_file, 'r') as f:
+                data = json.load(f)
+                # Convert old format to new format if necessary
+                if isinstance(data, dict) and 'files' in data:
+                    return {
+                        'files': [self._normalize_entry(f) for f in data['files']],
+                        'last_update': data.get('last_update', datetime.now().isoformat())
+                    }
+                return data
+        except (FileNotFoundError,) + _JSON_ERRORS:
+            return {'files': [], 'last_update': None}
+
+    def _stream_processed_files(self):
+        """Load a large tracker entry by entry so the raw text and parsed tree never coexist"""
+        with open(self.processed_file, 'rb') as f:
+            files = [self._normalize_entry(entry) for entry in ijson.items(f, 'files.item')]
+            f.seek(0)
+            last_update = next(ijson.items(f, 'last_update'), None)
+        return {
+            'files': files,
+            'last_update': last_update or datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _normalize_entry(entry):
+        """Build a tracker entry from either the dict or the old plain-path format"""
+        if isinstance(entry, dict):
+            # Already in new format
+            path = entry['path']
+        else:
+            # Old format - just a path string
+            path = entry
+        return {
+            'path': _norm(path),
+            'last_seen': datetime.now().isoformat(),
+            'still_exists': os.path.exists(path)
+        }
         
     def cleanup_old_entries(self):
         """Remove entries for files that no longer exist"""
@@ -63,30 +133,59 @@ class ProcessedFilesManager:
         if len(self.processed_files['files']) > self.cleanup_threshold:
             self.cleanup_old_entries()
             
-        # Create backup before saving
-        if self.processed_file.exists():
-            backup_path = self.output_dir / f'processed_files.{datetime.now().strftime("%Y%m%d")}.bak'
-            shutil.copy2(self.processed_file, backup_path)
-            
-            # Keep only last 5 backups
-            backups = sorted(self.output_dir.glob('processed_files.*.bak'))
-            if len(backups) > 5:
-                for old_backup in backups[:-5]:
-                    old_backup.unlink()
-        
-        with open(self.processed_file, 'w') as f:
+        tmp_file = self.processed_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
             self.processed_files['last_update'] = datetime.now().isoformat()
             json.dump(self.processed_files, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep the previous version as a backup, then swap the new file in atomically
+        if self.processed_file.exists():
+            self._rotate_backups()
+        os.replace(tmp_file, self.processed_file)
+
+    def _rotate_backups(self):
+        """Shift processed_files.N.bak up by one and back up the current file as .0.bak"""
+        backups = [self.output_dir / f'processed_files.{i}.bak' for i in range(self.backup_count)]
+        for i in range(self.backup_count - 1, 0, -1):
+            try:
+                os.replace(backups[i - 1], backups[i])
+            except FileNotFoundError:
+                pass
+        try:
+            os.unlink(backups[0])
+        except FileNotFoundError:
+            pass
+        try:
+            # Hard link: the old inode survives the os.replace() in save_processed_files
+            os.link(self.processed_file, backups[0])
+        except OSError:
+            shutil.copy2(self.processed_file, backups[0])
+        if not self._legacy_backups_checked:
+            self._remove_legacy_backups()
+            self._legacy_backups_checked = True
+
+    def _remove_legacy_backups(self):
+        """Delete processed_files.YYYYMMDD.bak copies left by older versions.
+
+        The ring above replaces them, and nothing would prune them otherwise.
+        """
+        for backup in self.output_dir.glob('processed_files.' + '[0-9]' * 8 + '.bak'):
+            try:
+                backup.unlink()
+            except OSError:
+                pass
 
     def is_file_processed(self, file_path):
         """Check if a file has been processed before"""
-        str_path = str(file_path)
+        str_path = _norm(file_path)
         return any(entry['path'] == str_path and entry['still_exists'] 
                    for entry in self.processed_files['files'])
 
     def add_processed_file(self, file_path):
         """Add a file to the processed list with metadata"""
-        file_path_str = str(file_path)
+        file_path_str = _norm(file_path)
         # Check if entry already exists
         for entry in self.processed_files['files']:
             if entry['path'] == file_path_str:
@@ -102,9 +201,29 @@ class ProcessedFilesManager:
             'first_processed': datetime.now().isoformat()
         })
 
+    def add_processed_files(self, file_paths):
+        """Add several files at once, indexing the existing entries a single time"""
+        now = datetime.now().isoformat()
+        entries = {entry['path']: entry for entry in self.processed_files['files']}
+        for file_path in file_paths:
+            file_path_str = _norm(file_path)
+            entry = entries.get(file_path_str)
+            if entry is not None:
+                entry['last_seen'] = now
+                entry['still_exists'] = True
+                continue
+            entry = {
+                'path': file_path_str,
+                'last_seen': now,
+                'still_exists': True,
+                'first_processed': now
+            }
+            entries[file_path_str] = entry
+            self.processed_files['files'].append(entry)
+
     def remove_processed_file(self, file_path):
         """Remove a file from the processed list"""
-        file_path_str = str(file_path)
+        file_path_str = _norm(file_path)
         self.processed_files['files'] = [
             entry for entry in self.processed_files['files'] 
             if entry['path'] != file_path_str
@@ -112,11 +231,14 @@ class ProcessedFilesManager:
 
     def get_processing_stats(self):
         """Get statistics about processed files"""
-        now = datetime.now()
+        total = existing = 0
+        for f in self.processed_files['files']:
+            total += 1
+            existing += f['still_exists']
         stats = {
-            'total_files': len(self.processed_files['files']),
-            'existing_files': sum(1 for f in self.processed_files['files'] if f['still_exists']),
-            'missing_files': sum(1 for f in self.processed_files['files'] if not f['still_exists']),
+            'total_files': total,
+            'existing_files': existing,
+            'missing_files': total - existing,
             'last_update': self.processed_files['last_update'],
         }
         return stats
@@ -125,12 +247,8 @@ class ProcessedFilesManager:
         """Find .safetensors files recursively, following symbolic links"""
         safetensors_files = []
         try:
-            for root, dirs, files in os.walk(directory_path, followlinks=True):
-                for file in files:
-                    if file.lower().endswith(('.safetensors', '.ckpt', '.pt', '.pth', '.bin')):
-                        file_path = Path(root) / file
-                        if file_path.exists():  # Double-check in case of broken symlinks
-                            safetensors_files.append(file_path)
+            # iter_model_files already skips broken symlinks
+            safetensors_files = [Path(p) for p in iter_model_files(directory_path)]
         except Exception as e:
             print(f"Error scanning directory {directory_path}: {e}")
         return safetensors_files
@@ -138,7 +256,12 @@ class ProcessedFilesManager:
     def get_new_files(self, directory_path):
         """Get list of new safetensors files that haven't been processed"""
         all_files = self._find_safetensors_files(directory_path)
-        return [f for f in all_files if not self.is_file_processed(f)]
+        # One set lookup per file instead of scanning every tracker entry
+        processed = {
+            entry['path'] for entry in self.processed_files['files']
+            if entry['still_exists']
+        }
+        return [f for f in all_files if _norm(f) not in processed]
     
     def update_timestamp(self):
         """Update the last_update timestamp without modifying the files list"""
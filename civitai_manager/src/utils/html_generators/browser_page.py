@@ -1,11 +1,16 @@
 import time
+import gzip
 from pathlib import Path
 import html
 from ..string_utils import sanitize_filename
 import json
+import logging
 from datetime import datetime
 from civitai_manager import __version__
-from civitai_manager.src.utils.web_helpers import find_model_file_path
+from civitai_manager.src.utils.string_utils import load_json_file
+from civitai_manager.src.utils.web_helpers import find_model_file_path, find_preview_image, index_model_files
+
+logger = logging.getLogger(__name__)
 
 def generate_global_summary(output_dir, models_dir):
     """
@@ -15,7 +20,7 @@ def generate_global_summary(output_dir, models_dir):
         output_dir (Path): Directory containing the JSON files
         models_dir (str): Directory containing the actual model files
     """
-    print("DEBUG: Entering generate_global_summary().")
+    logger.debug("Entering generate_global_summary().")
     start_time = time.time()
     try:
         # Find all model.json files
@@ -34,6 +39,8 @@ def generate_global_summary(output_dir, models_dir):
         
         # Dictionary to store models by type
         models_by_type = {}
+        # Walk models_dir once instead of once per model
+        model_file_index = index_model_files(models_dir) if models_dir else {}
         
         for model_file in model_files:
             try:
@@ -44,18 +51,15 @@ def generate_global_summary(output_dir, models_dir):
                 
         
                 # Read all files
-                with open(model_file, 'r', encoding='utf-8') as f:
-                    model_data = json.load(f)
+                model_data = load_json_file(model_file)
 
                 version_data = {}
                 if version_file.exists():
-                    with open(version_file, 'r', encoding='utf-8') as f:
-                        version_data = json.load(f)
+                    version_data = load_json_file(version_file)
                         
                 hash_data = {}
                 if hash_file.exists():
-                    with open(hash_file, 'r', encoding='utf-8') as f:
-                        hash_data = json.load(f)
+                    hash_data = load_json_file(hash_file)
 
                 model_type = model_data.get('type', 'Unknown')
                 
@@ -77,6 +81,7 @@ def generate_global_summary(output_dir, models_dir):
                     'has_html': (Path(output_dir) / base_name / f"{base_name}.html").exists(),
                     'added_date': hash_data.get('timestamp', ''),
                     'file_size': version_data.get('files', [{}])[0].get('sizeKB', None),
+                    'preview_filename': find_preview_image(model_file.parent),
                     'files': [] # Initialize files list
                 }
 
@@ -85,13 +90,14 @@ def generate_global_summary(output_dir, models_dir):
                     stored_hash = hash_data.get('hash_value')
                     stored_filename = hash_data.get('filename')
                     if stored_hash and stored_filename:
-                        rel_path = find_model_file_path(models_dir, stored_hash, stored_filename)
+                        rel_path = find_model_file_path(models_dir, stored_hash, stored_filename,
+                                                        file_index=model_file_index)
                         if rel_path:
                             model_entry['files'].append(rel_path)
 
                 models_by_type[model_type].append(model_entry)
             except Exception as e:
-                print(f"DEBUG: Error processing model file {model_file}: {e}")
+                logger.error("Error processing model file %s: %s", model_file, e)
                 continue
 
         # Process missing models
@@ -535,20 +541,25 @@ def generate_global_summary(output_dir, models_dir):
                 model['model_type'] = model_type
                 all_models_list.append(model)
 
-        print("DEBUG: Writing all_models_summary.json...")
+        logger.debug("Writing all_models_summary.json...")
         json_summary_path = output_dir / 'all_models_summary.json'
+        summary_json = json.dumps(all_models_list, indent=2)
         with open(json_summary_path, 'w', encoding='utf-8') as f:
-            json.dump(all_models_list, f, indent=2)
-        print(f"DEBUG: All models summary JSON generated: {json_summary_path} (took {time.time() - start_time:.4f} seconds for data collection and JSON write).")
+            f.write(summary_json)
+        # Precompressed copy, served to clients that accept gzip
+        with gzip.open(f"{json_summary_path}.gz", 'wb') as f:
+            f.write(summary_json.encode('utf-8'))
+        logger.debug("All models summary JSON generated: %s (took %.4f seconds for data collection and JSON write).",
+                     json_summary_path, time.time() - start_time)
 
         # Write the summary file
         summary_path = Path(output_dir) / 'index.html'
         with open(summary_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
-        print(f"DEBUG: Global summary HTML generated: {summary_path}")
+        logger.debug("Global summary HTML generated: %s", summary_path)
         return True
 
     except Exception as e:
-        print(f"DEBUG: Error generating global summary: {str(e)}")
+        logger.error("Error generating global summary: %s", e)
         return False
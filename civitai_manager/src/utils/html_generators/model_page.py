@@ -1,8 +1,30 @@
+import os
 import json
 import html
 from ..string_utils import sanitize_filename
 from datetime import datetime
 from civitai_manager import __version__
+from civitai_manager.src.utils.string_utils import load_json_file
+
+# Gallery order: images grouped by extension in this order, then videos
+PREVIEW_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.mp4')
+
+def _list_previews(directory, base_name):
+    """Return the <base_name>_preview* files in directory, grouped by
+    PREVIEW_EXTENSIONS and sorted by name within each group.
+
+    One scandir replaces a glob (and its directory listing) per extension.
+    """
+    prefix = f"{base_name}_preview"
+    try:
+        with os.scandir(directory) as it:
+            names = sorted(e.name for e in it
+                           if e.name.startswith(prefix) and e.name.endswith(PREVIEW_EXTENSIONS))
+    except OSError:
+        return []
+    return [directory / name
+            for ext in PREVIEW_EXTENSIONS
+            for name in names if name.endswith(ext)]
 
 def generate_html_summary(output_dir, safetensors_path):
     """
@@ -20,18 +42,8 @@ def generate_html_summary(output_dir, safetensors_path):
         html_path = output_dir / f"{base_name}.html"
         
         # Find all preview images (support new 'previews' subfolder and legacy root)
-        previews_root = list(sorted(output_dir.glob(f"{base_name}_preview*.jpg")) +
-                              sorted(output_dir.glob(f"{base_name}_preview*.jpeg")) +
-                              sorted(output_dir.glob(f"{base_name}_preview*.png")) +
-                              sorted(output_dir.glob(f"{base_name}_preview*.mp4")))
-        previews_sub = []
-        try:
-            previews_sub = list(sorted((output_dir / 'previews').glob(f"{base_name}_preview*.jpg")) +
-                                sorted((output_dir / 'previews').glob(f"{base_name}_preview*.jpeg")) +
-                                sorted((output_dir / 'previews').glob(f"{base_name}_preview*.png")) +
-                                sorted((output_dir / 'previews').glob(f"{base_name}_preview*.mp4")))
-        except Exception:
-            previews_sub = []
+        previews_root = _list_previews(output_dir, base_name)
+        previews_sub = _list_previews(output_dir / 'previews', base_name)
         preview_images = previews_sub or previews_root
 
         
@@ -42,12 +54,9 @@ def generate_html_summary(output_dir, safetensors_path):
             
         # Read JSON data
         try:
-            with open(model_path, 'r', encoding='utf-8') as f:
-                model_data = json.load(f)
-            with open(version_path, 'r', encoding='utf-8') as f:
-                version_data = json.load(f)
-            with open(hash_path, 'r', encoding='utf-8') as f:
-                hash_data = json.load(f)
+            model_data = load_json_file(model_path)
+            version_data = load_json_file(version_path)
+            hash_data = load_json_file(hash_path)
 
             # Get stats data
             model_version = next((version for version in model_data["modelVersions"] if version["id"] == version_data.get('id')), None)
@@ -71,8 +80,7 @@ def generate_html_summary(output_dir, safetensors_path):
                     metadata = {}
                     if json_path.exists():
                         try:
-                            with open(json_path, 'r', encoding='utf-8') as f:
-                                metadata = json.load(f)
+                            metadata = load_json_file(json_path)
                         except Exception:
                             pass
                             
@@ -3,10 +3,11 @@ from datetime import datetime
 from typing import Dict, Optional, List
 from pathlib import Path
 import threading
+import heapq
 import logging
-from queue import Queue
+from collections import deque
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ProcessStatus:
     filename: str
     status: str  # 'pending', 'processing', 'completed', 'failed'
@@ -16,18 +17,28 @@ class ProcessStatus:
     progress: float = 0.0
 
 class ProcessManager:
-    def __init__(self):
+    def __init__(self, num_workers: int = 1):
         self._processes: Dict[str, ProcessStatus] = {}
         self._lock = threading.Lock()
-        self._queue = Queue()
-        self._worker = threading.Thread(target=self._process_queue, daemon=True)
-        self._worker.start()
         self._max_history = 100
+        # Finished statuses in completion order, so trimming is O(1)
+        self._finished = deque()
+        # deque.append/popleft are atomic; the event only wakes idle workers
+        self._queue = deque()
+        self._queue_event = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._process_queue, daemon=True)
+            for _ in range(max(1, num_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
         
     def add_process(self, filename: str) -> str:
         """Add a new process to track"""
         with self._lock:
             process_id = filename
+            # Re-adding a file moves it to the newest end of the history
+            self._processes.pop(process_id, None)
             self._processes[process_id] = ProcessStatus(
                 filename=filename,
                 status='pending',
@@ -43,6 +54,14 @@ class ProcessManager:
         with self._lock:
             if process_id in self._processes:
                 process = self._processes[process_id]
+                if status in ['completed', 'failed'] and process.status not in ['completed', 'failed']:
+                    self._finished.append(process)
+                    if len(self._finished) > 2 * self._max_history:
+                        # Drop statuses replaced by a re-added file
+                        self._finished = deque(
+                            p for p in self._finished
+                            if self._processes.get(p.filename) is p
+                        )
                 process.status = status
                 if error:
                     process.error = error
@@ -67,31 +86,43 @@ class ProcessManager:
         with self._lock:
             completed = [p for p in self._processes.values() 
                        if p.status in ['completed', 'failed']]
-            completed.sort(key=lambda x: x.end_time or datetime.min, reverse=True)
-            return completed[:limit]
+            return heapq.nlargest(limit, completed, key=lambda x: x.end_time or datetime.min)
             
     def _cleanup_old_processes(self):
-        """Remove old completed processes"""
-        processes = list(self._processes.items())
-        processes.sort(key=lambda x: x[1].end_time or datetime.max, reverse=True)
-        
-        # Keep only the most recent ones
-        self._processes = dict(processes[:self._max_history])
+        """Remove old processes, oldest finished ones first"""
+        while len(self._processes) > self._max_history:
+            while self._finished:
+                process = self._finished.popleft()
+                # Skip entries that were already evicted or re-added since
+                if self._processes.get(process.filename) is process:
+                    del self._processes[process.filename]
+                    break
+            else:
+                # Nothing finished left: drop the oldest tracked process
+                del self._processes[next(iter(self._processes))]
         
+    def pending_count(self) -> int:
+        """Number of queued tasks not yet picked up by a worker"""
+        return len(self._queue)
+
     def queue_process(self, func, *args, **kwargs):
         """Queue a process for execution"""
-        self._queue.put((func, args, kwargs))
+        self._queue.append((func, args, kwargs))
+        self._queue_event.set()
         
     def _process_queue(self):
         """Worker thread to process the queue"""
         while True:
+            self._queue_event.wait()
+            try:
+                func, args, kwargs = self._queue.popleft()
+            except IndexError:
+                self._queue_event.clear()
+                # Re-check so an append racing with clear() isn't left waiting
+                if self._queue:
+                    self._queue_event.set()
+                continue
             try:
-                func, args, kwargs = self._queue.get()
-                try:
-                    func(*args, **kwargs)
-                except Exception as e:
-                    logging.error(f"Error in queued process: {e}")
+                func(*args, **kwargs)
             except Exception as e:
-                logging.error(f"Error in process queue: {e}")
-            finally:
-                self._queue.task_done()
+                logging.error(f"Error in queued process: {e}")
@@ -1,4 +1,5 @@
 import os
+import stat
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -16,19 +17,15 @@ def validate_path(base_path: str, requested_path: str) -> Tuple[bool, Optional[s
         - absolute_path: The validated absolute path or None if invalid
     """
     try:
-        # Convert to absolute paths
-        base_abs = os.path.abspath(base_path)
-        requested_abs = os.path.abspath(os.path.join(base_path, requested_path))
+        # resolve(strict=True) follows symlinks and raises if the path is missing
+        base = Path(base_path).resolve()
+        requested = (base / requested_path).resolve(strict=True)
         
         # Check if the requested path is within base path
-        if not requested_abs.startswith(base_abs):
+        if not requested.is_relative_to(base):
             return False, None
             
-        # Check if path exists
-        if not os.path.exists(requested_abs):
-            return False, None
-            
-        return True, requested_abs
+        return True, str(requested)
         
     except Exception:
         return False, None
@@ -45,19 +42,13 @@ def check_directory_access(path: str, require_write: bool = False) -> bool:
         bool: True if directory is accessible with required permissions
     """
     try:
-        path_obj = Path(path)
-        if not path_obj.exists() or not path_obj.is_dir():
-            return False
-            
-        # Check read access
-        if not os.access(path, os.R_OK):
-            return False
-            
-        # Check write access if required
-        if require_write and not os.access(path, os.W_OK):
-            return False
-            
-        return True
-        
-    except Exception:
+        st = os.stat(path)
+    except (OSError, ValueError, TypeError):
+        # Missing or unreadable paths, embedded NULs and non-path values
         return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+        
+    # Check read (and optionally write) access in one call
+    mode = os.R_OK | (os.W_OK if require_write else 0)
+    return os.access(path, mode)
@@ -1,8 +1,21 @@
 import re
+import json
 import hashlib
 import logging
+import mmap
+import threading
+from collections import OrderedDict
 import os # Import os module
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Runs of disallowed characters and underscores collapse to one underscore
+_UNSAFE_RUN = re.compile(r'[^a-zA-Z0-9.-]+')
+_DOT_RUN = re.compile(r'\.{2,}')
+
 def sanitize_filename(filename):
     """
     Sanitize a filename to be safe for various operating systems.
@@ -15,15 +28,13 @@ def sanitize_filename(filename):
     # Separate base name and extension using os.path.splitext
     base_name, extension = os.path.splitext(filename)
     
-    # Replace any character that is not a letter, number, underscore, hyphen, or dot with an underscore
+    # Replace any run of characters that are not a letter, number, hyphen, or dot
+    # (underscores included) with a single underscore
     # This handles special characters and non-ASCII characters
-    base_name = re.sub(r'[^a-zA-Z0-9._-]', '_', base_name)
-    
-    # Collapse multiple underscores to a single one
-    base_name = re.sub(r'_+', '_', base_name)
+    base_name = _UNSAFE_RUN.sub('_', base_name)
     
     # Collapse multiple dots to a single dot
-    base_name = re.sub(r'\.{2,}', '.', base_name)
+    base_name = _DOT_RUN.sub('.', base_name)
     
     # Remove leading/trailing underscores and dots
     base_name = base_name.strip('._')
@@ -36,28 +47,120 @@ def sanitize_filename(filename):
     return final_name
 
 
-def calculate_sha256(file_path, buffer_size=65536):
+def _new_sha256():
+    """SHA-256 object for content identification, not security.
+
+    usedforsecurity=False keeps OpenSSL builds in FIPS mode from refusing
+    or routing through their restricted provider.
+    """
+    return hashlib.sha256(usedforsecurity=False)
+
+def calculate_sha256(file_path, buffer_size=256 * 1024):
     """
     Calculate SHA256 hash of a file
     
+    Uses hashlib.file_digest where available (Python 3.11+), which reads
+    into one reused buffer and hashes without holding the GIL; otherwise
+    the file is read in buffer_size chunks into a reused buffer.
+    
     Args:
         file_path: Path to the file
-        buffer_size: Size of chunks to read
+        buffer_size: Size of chunks to read (fallback loop only)
         
     Returns:
         str: Hex digest of SHA256 hash, or None if file not found
     """
     try:
-        sha256_hash = hashlib.sha256()
         with open(file_path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, _new_sha256).hexdigest()
+            sha256_hash = _new_sha256()
+            buf = bytearray(buffer_size)
+            view = memoryview(buf)
             while True:
-                data = f.read(buffer_size)
-                if not data:
+                n = f.readinto(buf)
+                if not n:
                     break
-                sha256_hash.update(data)
+                sha256_hash.update(view[:n])
         return sha256_hash.hexdigest()
     except FileNotFoundError:
         return None
     except Exception as e:
         logging.error(f"Error calculating hash for {file_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# SHA256 of recently hashed model files keyed by path, valid while the
+# file's (st_dev, st_ino, st_size, st_mtime_ns) match (least recently used evicted)
+FILE_HASH_CACHE_SIZE = 1024
+_file_hash_cache = OrderedDict()
+_file_hash_cache_lock = threading.Lock()
+
+def cached_sha256(path):
+    """calculate_sha256 memoized on the file's identity, size and mtime.
+
+    Model files are several GB; both processing (extract_hash) and
+    generate_global_summary's verification hash them, and unchanged files
+    are only read once per process. Failed hashes (None) are not cached.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _file_hash_cache_lock:
+        cached = _file_hash_cache.get(path)
+        if cached is not None and cached[0] == key:
+            _file_hash_cache.move_to_end(path)
+            return cached[1]
+
+    file_hash = calculate_sha256(path)
+    if file_hash is not None:
+        with _file_hash_cache_lock:
+            _file_hash_cache[path] = (key, file_hash)
+            _file_hash_cache.move_to_end(path)
+            while len(_file_hash_cache) > FILE_HASH_CACHE_SIZE:
+                _file_hash_cache.popitem(last=False)
+    return file_hash
+
+# Metadata files at least this large are parsed from a read-only memory map
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+def load_json_file(path):
+    """Read and parse a JSON file, using orjson when it is installed.
+
+    Small files are read with a single os.read of the stat'ed size, which
+    skips the buffered file object and its extra read for EOF. Large files
+    are memory-mapped so orjson parses the page cache directly instead of a
+    bytes copy of the whole file.
+    """
+    if orjson is not None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size >= MMAP_THRESHOLD_BYTES:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            data = os.read(fd, size)
+            while len(data) < size:
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            os.close(fd)
+        return orjson.loads(data)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def dump_json_file(path, data, indent=False):
+    """Write data as JSON to path, using orjson when it is installed.
+
+    indent=True writes two-space indented output for files people edit.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2 if indent else None)
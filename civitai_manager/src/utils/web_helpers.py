@@ -1,78 +1,151 @@
 import os
-import json
+import logging
+import functools
+import threading
+from collections import OrderedDict
 
-from civitai_manager.src.utils.string_utils import calculate_sha256
+from civitai_manager.src.utils.string_utils import cached_sha256, dump_json_file, load_json_file
+from civitai_manager.src.utils.file_tracker import iter_files, iter_model_files
+
+logger = logging.getLogger(__name__)
 
 CONFIG_FILE = os.environ.get('CONFIG_FILE', os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'config.json')))
 
-def find_model_file_path(models_dir, stored_hash, stored_filename):
+_WEB_CONFIG_DEFAULTS = {
+    'models_directory': '',
+    'output_directory': '',
+    'download_all_images': False,
+    'notimeout': False,
+    'skip_images': False,
+    'user_images_limit': 0,
+    'user_posts_limit': 0,
+    'images_per_post_limit': 0,
+}
+
+# Matched with name.lower().endswith(IMAGE_EXTENSIONS): on CPython this beats a
+# precompiled regex search and splitext/frozenset lookups for typical names
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+def _first_image_in(directory):
+    """Return the alphabetically first image file name in directory, or None."""
+    try:
+        with os.scandir(directory) as it:
+            return min((e.name for e in it
+                        if e.name.lower().endswith(IMAGE_EXTENSIONS) and e.is_file()),
+                       default=None)
+    except OSError:
+        return None
+
+def find_preview_image(model_dir):
+    """Return the preview image of a model output directory relative to it.
+
+    Images in ``previews/`` win over images next to the metadata files.
+    Returns None if the directory holds no images.
+    """
+    preview = _first_image_in(os.path.join(model_dir, 'previews'))
+    if preview:
+        return f'previews/{preview}'
+    return _first_image_in(model_dir)
+
+# Parsed metadata files kept by load_json_cached (least recently used evicted)
+JSON_CACHE_SIZE = 1024
+_json_cache = OrderedDict()
+_json_cache_lock = threading.Lock()
+
+def load_json_cached(path):
+    """load_json_file memoized on the file's (st_mtime_ns, st_size).
+
+    The returned object is shared between callers and must not be mutated;
+    copy whatever needs changing.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _json_cache_lock:
+        cached = _json_cache.get(path)
+        if cached is not None and cached[0] == key:
+            _json_cache.move_to_end(path)
+            return cached[1]
+
+    data = load_json_file(path)
+    with _json_cache_lock:
+        _json_cache[path] = (key, data)
+        _json_cache.move_to_end(path)
+        while len(_json_cache) > JSON_CACHE_SIZE:
+            _json_cache.popitem(last=False)
+    return data
+
+def _iter_named_files(root, filename):
+    """Yield paths below root whose basename equals filename"""
+    return iter_files(root, lambda name: name == filename)
+
+def index_model_files(models_dir):
+    """Map each model file name below models_dir to the paths it occurs at.
+
+    One walk, for callers that look up many models at once; pass the
+    result to find_model_file_path as file_index.
+    """
+    index = {}
+    for path in iter_model_files(models_dir):
+        index.setdefault(os.path.basename(path), []).append(path)
+    return index
+
+def find_model_file_path(models_dir, stored_hash, stored_filename, file_index=None):
     """
     Finds a model file recursively and verifies it with a hash check.
     Returns the relative path to the model file or None if not found/verified.
+    With file_index from index_model_files, candidates are looked up there
+    instead of walking models_dir.
     """
-    candidate_paths = []
-    for root, _, files in os.walk(models_dir):
-        if stored_filename in files:
-            candidate_paths.append(os.path.join(root, stored_filename))
-
-    if not candidate_paths:
-        return None
-    
-    for file_path in candidate_paths:
-        if calculate_sha256(file_path) == stored_hash:
+    if file_index is not None:
+        candidates = file_index.get(stored_filename, ())
+    else:
+        candidates = _iter_named_files(models_dir, stored_filename)
+    for file_path in candidates:
+        if cached_sha256(file_path) == stored_hash:
             return os.path.relpath(file_path, models_dir)
 
     return None
 
+@functools.lru_cache(maxsize=4)
+def _load_web_config_cached(config_file_path, mtime_ns, size):
+    """Parse the config file; keyed on its stat so edits invalidate the cache."""
+    config = load_json_file(config_file_path)
+    return {**_WEB_CONFIG_DEFAULTS, **config}
+
 def load_web_config(config_file_path=None):
-    print(f"DEBUG: Attempting to load config from: {config_file_path}")
+    logger.debug("Attempting to load config from: %s", config_file_path)
     if config_file_path is None:
         config_file_path = CONFIG_FILE
-        print(f"DEBUG: config_file_path was None, defaulting to: {config_file_path}")
+        logger.debug("config_file_path was None, defaulting to: %s", config_file_path)
+    try:
+        st = os.stat(config_file_path)
+    except OSError:
+        logger.debug("Config file does NOT exist at: %s", config_file_path)
+        return {}
     try:
-        if os.path.exists(config_file_path):
-            print(f"DEBUG: Config file exists at: {config_file_path}")
-            with open(config_file_path, 'r') as f:
-                config = json.load(f)
-                print(f"DEBUG: Successfully loaded config: {config}")
-                
-                if 'models_directory' not in config:
-                    config['models_directory'] = ''
-                if 'output_directory' not in config:
-                    config['output_directory'] = ''
-                if 'download_all_images' not in config:
-                    config['download_all_images'] = False
-                if 'notimeout' not in config:
-                    config['notimeout'] = False
-                if 'skip_images' not in config:
-                    config['skip_images'] = False
-                if 'user_images_limit' not in config:
-                    config['user_images_limit'] = 0
-                if 'user_posts_limit' not in config:
-                    config['user_posts_limit'] = 0
-                if 'images_per_post_limit' not in config:
-                    config['images_per_post_limit'] = 0
-                
-                return config
-        else:
-            print(f"DEBUG: Config file does NOT exist at: {config_file_path}")
+        # Hand out a copy so callers can't mutate the cached dict
+        config = dict(_load_web_config_cached(config_file_path, st.st_mtime_ns, st.st_size))
+        logger.debug("Successfully loaded config: %s", config)
+        return config
     except Exception as e:
-        print(f"ERROR: Error loading config from {config_file_path}: {e}")
+        logger.error("Error loading config from %s: %s", config_file_path, e)
     return {}
 
 def save_web_config(config, config_file_path=None):
-    print(f"DEBUG: Attempting to save config to: {config_file_path}")
-    print(f"DEBUG: Config data to save: {config}")
+    logger.debug("Attempting to save config to: %s", config_file_path)
+    logger.debug("Config data to save: %s", config)
     if config_file_path is None:
         config_file_path = CONFIG_FILE
-        print(f"DEBUG: config_file_path was None, defaulting to: {config_file_path}")
+        logger.debug("config_file_path was None, defaulting to: %s", config_file_path)
     try:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(config_file_path), exist_ok=True)
-        with open(config_file_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        print(f"DEBUG: Successfully saved config to: {config_file_path}")
+        dump_json_file(config_file_path, config, indent=True)
+        # mtime granularity can be coarser than two quick writes; drop the cache explicitly
+        _load_web_config_cached.cache_clear()
+        logger.debug("Successfully saved config to: %s", config_file_path)
         return True
     except Exception as e:
-        print(f"ERROR: Error saving config to {config_file_path}: {e}")
-        return False
\ No newline at end of file
+        logger.error("Error saving config to %s: %s", config_file_path, e)
+        return False
@@ -3,50 +3,120 @@
 import os
 import json
 import shutil
+import hashlib
 from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, abort
+from flask.json.provider import DefaultJSONProvider
+from markupsafe import Markup
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileRequired, FileAllowed
 from wtforms import StringField, BooleanField, SubmitField, IntegerField, SelectField
 from wtforms.validators import DataRequired
+from urllib.parse import quote
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import FileWrapper
 import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import time
 from typing import Dict, Optional, Set
 from datetime import datetime
-import html # Add this import
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import queue
 import requests
 
-from civitai_manager.src.core.metadata_manager import (
-    process_single_file,
-    process_directory
-)
-from civitai_manager.src.utils.web_helpers import find_model_file_path, load_web_config, save_web_config
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+from civitai_manager.src.utils.web_helpers import find_model_file_path, find_preview_image, load_json_cached, load_web_config, save_web_config
 from civitai_manager.src.utils.html_generators.browser_page import generate_global_summary
+from civitai_manager.src.utils.config import MODEL_FILE_EXTENSIONS
 from civitai_manager.src.utils.file_tracker import ProcessedFilesManager
 from civitai_manager.src.utils.process_manager import ProcessManager
-from civitai_manager.src.utils.string_utils import sanitize_filename
+from civitai_manager.src.utils.string_utils import dump_json_file, load_json_file, sanitize_filename
 
-# Initialize process manager
-process_mgr = ProcessManager()
+logger = logging.getLogger(__name__)
+
+# Initialize process manager. Uploads are processed one at a time: each job
+# hashes a multi-GB file on the models disk and calls the rate-limited Civitai
+# API, and two uploads of the same name would write the same output folder.
+process_mgr = ProcessManager(num_workers=1)
 
 # Flask app configuration
-ALLOWED_EXTENSIONS = {'safetensors', 'ckpt', 'pt', 'pth', 'bin'}
-ALLOWED_MIMETYPES = ['application/octet-stream']
-ALLOWED_MIMETYPES = ['application/octet-stream']
-ALLOWED_MIMETYPES = ['application/octet-stream']
-ALLOWED_MIMETYPES = ['application/octet-stream']
-ALLOWED_MIMETYPES = ['application/octet-stream']
+# Bare extensions for FileAllowed; allowed_file matches MODEL_FILE_EXTENSIONS
+ALLOWED_EXTENSIONS = {ext.lstrip('.') for ext in MODEL_FILE_EXTENSIONS}
+UPLOAD_COPY_BUFSIZE = 1024 * 1024
+# Media files listed for downloaded user posts (matched with str.endswith,
+# like IMAGE_EXTENSIONS in web_helpers)
+SUPPORTED_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif')
+SUPPORTED_VIDEO_EXTS = ('.mp4', '.webm', '.ogg')
+USER_POST_MEDIA_EXTS = SUPPORTED_IMAGE_EXTS + SUPPORTED_VIDEO_EXTS
 ALLOWED_MIMETYPES = ['application/octet-stream']
+# Uploads waiting for a ProcessManager worker; further uploads get a 503
+MAX_QUEUED_UPLOADS = 64
 CONFIG_FILE = os.environ.get('CONFIG_FILE', os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config.json')))
 MODELS_DIR = os.environ.get('MODELS_DIR', '')
 OUTPUT_DIR = os.environ.get('OUTPUT_DIR', '')
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, falling back to Flask's
+    default hook for dates, decimals and other non-native types."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Compress API JSON and rendered pages. Streamed file responses are left
+# alone so they keep the sendfile path; large JSON files in the output
+# directory are served from precompressed .gz siblings instead.
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_STREAMS'] = False
+if Compress is not None:
+    Compress(app)
 
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024 * 1024
 app.config['CONFIG_FILE'] = CONFIG_FILE
+# Read size used when streaming local files without sendfile (dev server)
+app.config['STATIC_BLKSIZE'] = 128 * 1024
+# Browser cache lifetime for files under /local_static. Preview names are reused
+# when a model is reprocessed, so they are not marked immutable; after expiry the
+# browser revalidates with ETag/Last-Modified and usually gets a 304.
+app.config['LOCAL_STATIC_MAX_AGE'] = 24 * 60 * 60
+# Internal nginx location mapped to the models directory (e.g. "/_models/").
+# When set, /local_models responses only carry an X-Accel-Redirect header and
+# nginx sends the model file itself; see deploy/nginx.conf.
+app.config['MODELS_ACCEL_PREFIX'] = os.environ.get('MODELS_ACCEL_PREFIX', '')
+# Behind Apache mod_xsendfile or lighttpd, let send_from_directory answer with
+# an X-Sendfile header so the front server sends local files itself. nginx
+# serves /local_static/ directly instead (deploy/nginx.conf).
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
 
 def create_app():
     from flask_wtf.csrf import CSRFProtect
@@ -61,8 +131,71 @@ def create_app():
 
 app = create_app()
 
-processing_thread = None
+# "Process all" runs on a single long-lived worker instead of a fresh thread per request
+processing_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='process-all')
+processing_future: Optional[Future] = None
 cancel_processing_flag = threading.Event()
+# Shared by requests that read several metadata files at once
+metadata_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='metadata')
+# Pending debounced summary rebuild (see _schedule_summary)
+SUMMARY_REBUILD_DELAY = 2.0
+_summary_timer: Optional[threading.Timer] = None
+_summary_timer_lock = threading.Lock()
+
+def _processing_active() -> bool:
+    return processing_future is not None and not processing_future.done()
+
+def _schedule_summary(output_dir, models_dir):
+    """Rebuild the global summary after SUMMARY_REBUILD_DELAY seconds.
+
+    Each call restarts the delay, so a burst of uploads or deletions leads to
+    a single generate_global_summary run in a background thread instead of
+    one per model on the request or worker thread.
+    """
+    global _summary_timer
+    with _summary_timer_lock:
+        if _summary_timer is not None:
+            _summary_timer.cancel()
+        _summary_timer = threading.Timer(SUMMARY_REBUILD_DELAY, generate_global_summary,
+                                         args=(Path(output_dir), Path(models_dir)))
+        _summary_timer.daemon = True
+        _summary_timer.start()
+
+# Dashboard listing built from all_models_summary.json, keyed by summary path
+# and invalidated when the summary file's mtime changes. Cached listings hold
+# preview paths relative to local_static; get_models_info adds the URLs.
+_MODELS_INFO_CACHE: Dict[str, tuple] = {}
+# Direct-scan result per output directory: {output_dir: (dir mtime, time, result)}.
+# Reused while no model directory was added or removed, for at most
+# DIRECT_SCAN_TTL seconds so metadata edits inside a model still show up.
+DIRECT_SCAN_TTL = 30
+_DIRECT_SCAN_CACHE: Dict[str, tuple] = {}
+# Serialized /api/models body and its ETag for the last get_models_info
+# result: (result, bytes, etag). get_models_info returns the same object
+# while its caches are valid, so an identity check decides whether to reuse it.
+_MODELS_JSON_CACHE: tuple = (None, b'', '')
+# Listing with preview URLs per URL prefix: {(static prefix, placeholder URL):
+# (cached listing, listing with URLs)}, so each request's script root is used
+# and an unchanged listing keeps its identity for _MODELS_JSON_CACHE
+_LISTING_URL_VIEWS: Dict[tuple, tuple] = {}
+# Preview image per model directory: {item_path: (dir mtimes, relative filename)}
+_PREVIEW_CACHE: Dict[str, tuple] = {}
+# Model file per output item for the direct scan, loaded from <output>/_cache
+# Worker threads only read snapshot entries; the request thread merges their
+# results and saves the index under _MODEL_FILES_INDEX_LOCK
+_MODEL_FILES_INDEX: Dict[str, Dict] = {}
+_MODEL_FILES_INDEX_DIR: Optional[str] = None
+_MODEL_FILES_INDEX_LOCK = threading.Lock()
+# Loaded model_detail data for recently viewed models:
+# {model_path: (_model_detail_stamp, (metadata, version_data, user_posts))}
+# Images and post media hold local_path relative to local_static;
+# model_detail turns it into local_url for the current request
+MODEL_DETAIL_CACHE_SIZE = 64
+_MODEL_DETAIL_CACHE: 'OrderedDict[str, tuple]' = OrderedDict()
+_MODEL_DETAIL_CACHE_LOCK = threading.Lock()
+# model_detail loads in progress, keyed by model path (see _coalesced)
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
 
 # Simple in-memory cache for Civitai model version lookups
 _MODEL_VERSION_CACHE: Dict[int, Dict[str, str]] = {}
@@ -89,14 +222,13 @@ def _ensure_cache_loaded() -> None:
     if not path or not path.exists():
         return
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                for k, v in data.items():
-                    try:
-                        _MODEL_VERSION_CACHE[int(k)] = v if isinstance(v, dict) else {}
-                    except Exception:
-                        continue
+        data = load_json_file(path)
+        if isinstance(data, dict):
+            for k, v in data.items():
+                try:
+                    _MODEL_VERSION_CACHE[int(k)] = v if isinstance(v, dict) else {}
+                except Exception:
+                    continue
     except Exception:
         pass
 
@@ -110,13 +242,11 @@ def _save_cache_entry(version_id: int, payload: Dict[str, str]) -> None:
         existing: Dict[str, Dict[str, str]] = {}
         if path.exists():
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    existing = json.load(f) or {}
+                existing = load_json_file(path) or {}
             except Exception:
                 existing = {}
         existing[str(int(version_id))] = payload
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(existing, f, indent=2)
+        dump_json_file(path, existing, indent=True)
     except Exception:
         pass
 
@@ -173,19 +303,17 @@ def is_configured(app_instance):
     models_dir = app_instance.config.get('models_directory') # Use 'models_directory' from config
     output_dir = app_instance.config.get('output_directory') # Use 'output_directory' from config
     
-    print(f"DEBUG: is_configured check - models_dir: {models_dir}, output_dir: {output_dir}")
+    logger.debug("is_configured check - models_dir: %s, output_dir: %s", models_dir, output_dir)
     
     models_dir_exists = False
     if models_dir:
-        models_dir_path = Path(models_dir)
-        models_dir_exists = models_dir_path.exists()
-        print(f"DEBUG: models_dir_path: {models_dir_path}, exists: {models_dir_exists}")
+        models_dir_exists = os.path.exists(models_dir)
+        logger.debug("models_dir: %s, exists: %s", models_dir, models_dir_exists)
     
     output_dir_exists = False
     if output_dir:
-        output_dir_path = Path(output_dir)
-        output_dir_exists = output_dir_path.exists()
-        print(f"DEBUG: output_dir_path: {output_dir_path}, exists: {output_dir_exists}")
+        output_dir_exists = os.path.exists(output_dir)
+        logger.debug("output_dir: %s, exists: %s", output_dir, output_dir_exists)
         
     return (models_dir and output_dir and models_dir_exists and output_dir_exists)
 
@@ -236,7 +364,7 @@ class UploadForm(FlaskForm):
     submit = SubmitField('Upload Model')
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(MODEL_FILE_EXTENSIONS)
 
 def load_model_data(model_file, output_dir):
     """Load the model data from the metadata files"""
@@ -251,97 +379,371 @@ def load_model_data(model_file, output_dir):
     }
     
     # Try to load model metadata
-    model_name = Path(model_file).stem
-    model_dir = Path(output_dir) / model_name
+    model_name = os.path.splitext(os.path.basename(model_file))[0]
+    model_dir = os.path.join(output_dir, model_name)
     
     # Load version data
-    version_file = model_dir / f"{model_name}_civitai_model_version.json"
-    if version_file.exists():
+    version_file = os.path.join(model_dir, f"{model_name}_civitai_model_version.json")
+    if os.path.exists(version_file):
         try:
-            with open(version_file, 'r') as f:
-                model_data['version'] = json.load(f)
+            model_data['version'] = load_json_cached(version_file)
         except Exception as e:
-            print(f"Error loading version data: {e}")
+            logger.error("Error loading version data: %s", e)
             
     # Load model data
-    model_file = model_dir / f"{model_name}_civitai_model.json"
-    if model_file.exists():
+    model_file = os.path.join(model_dir, f"{model_name}_civitai_model.json")
+    if os.path.exists(model_file):
         try:
-            with open(model_file, 'r') as f:
-                data = json.load(f)
-                model_data.update(data)
+            model_data.update(load_json_cached(model_file))
         except Exception as e:
-            print(f"Error loading model data: {e}")
+            logger.error("Error loading model data: %s", e)
             
     return model_data
 
 
 
+def _load_metadata_file(path, kind):
+    """Load a metadata JSON file for model_detail; {} if missing or unreadable"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        return load_json_cached(path)
+    except json.JSONDecodeError as e:
+        logger.error("JSONDecodeError when loading %s metadata from %s: %s", kind, path, e)
+    except Exception as e:
+        logger.error("Unexpected error when loading %s metadata from %s: %s", kind, path, e)
+    return {}
+
+def _list_file_names(directory):
+    """Return the names of the regular files in directory (empty if missing)"""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if e.is_file()}
+    except OSError:
+        return set()
+
+def _local_static_url_prefix():
+    """URL prefix of local_static_files.
+
+    Loops over many images build their URLs as prefix + quote(path) instead
+    of routing every one through url_for.
+    """
+    return url_for('local_static_files', filename='_')[:-1]
+
+def _find_preview_image(item_path):
+    """Cached find_preview_image for a model output directory.
+
+    The result is only rescanned when the model directory or its previews
+    directory changes.
+    """
+    previews_path = os.path.join(item_path, 'previews')
+    try:
+        item_mtime = os.stat(item_path).st_mtime_ns
+    except OSError:
+        return None
+    try:
+        previews_mtime = os.stat(previews_path).st_mtime_ns
+    except OSError:
+        previews_mtime = None
+
+    key = (item_mtime, previews_mtime)
+    cached = _PREVIEW_CACHE.get(item_path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    preview = find_preview_image(item_path)
+    _PREVIEW_CACHE[item_path] = (key, preview)
+    return preview
+
+def _model_files_index(output_dir):
+    """Return the persisted {item: {'hash_mtime_ns', 'rel_path'}} index for output_dir.
+
+    The index remembers where each model's file was found so the direct scan
+    does not re-walk models_dir and re-hash model files on every request.
+    Callers must hold _MODEL_FILES_INDEX_LOCK.
+    """
+    global _MODEL_FILES_INDEX, _MODEL_FILES_INDEX_DIR
+    if _MODEL_FILES_INDEX_DIR != output_dir:
+        try:
+            data = load_json_file(os.path.join(output_dir, '_cache', 'model_files.json'))
+        except (OSError, ValueError):
+            data = {}
+        _MODEL_FILES_INDEX = data if isinstance(data, dict) else {}
+        _MODEL_FILES_INDEX_DIR = output_dir
+    return _MODEL_FILES_INDEX
+
+def _write_cache_file(output_dir, name, data):
+    """Atomically write data as JSON to output_dir/_cache/name"""
+    path = os.path.join(output_dir, '_cache', name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        dump_json_file(tmp_path, data)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error("Could not write cache file %s: %s", path, e)
+
+def _save_model_files_index(output_dir, index):
+    """Atomically write the model file index to output_dir/_cache"""
+    _write_cache_file(output_dir, 'model_files.json', index)
+
+def _load_cooked_models_info(output_dir, summary_mtime, output_mtime):
+    """Return the post-processed dashboard list saved for this summary, or None.
+
+    get_models_info stores its result in output_dir/_cache/models_info.json
+    together with the summary file's and output directory's mtimes, so a
+    restarted server can skip re-escaping the summary for every model.
+    Preview paths are not stored and are looked up again here, and version
+    names are re-read for models whose version file changed since.
+    """
+    try:
+        data = load_json_file(os.path.join(output_dir, '_cache', 'models_info.json'))
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(data, dict)
+            or data.get('summary_mtime_ns') != summary_mtime
+            or data.get('output_mtime_ns') != output_mtime):
+        return None
+    models = data.get('models')
+    type_counts = data.get('type_counts')
+    total_size_gb = data.get('total_size_gb')
+    version_mtimes = data.get('version_mtimes')
+    if (not isinstance(models, list) or not isinstance(type_counts, dict)
+            or not isinstance(total_size_gb, (int, float))
+            or not isinstance(version_mtimes, dict)
+            or not all(isinstance(m, dict) and 'base_name' in m for m in models)):
+        return None
+    for model in models:
+        item = model['base_name']
+        item_path = os.path.join(output_dir, item)
+        _set_summary_preview(model, item_path)
+        _mark_summary_escaped(model)
+        version_file = os.path.join(item_path, f"{item}_civitai_model_version.json")
+        version_mtime = _mtime_ns(version_file)
+        if version_mtime != version_mtimes.get(item):
+            model['versions'] = _version_names(version_file, item) if version_mtime is not None else []
+    return models, type_counts, total_size_gb
+
+def _mtime_ns(path):
+    """st_mtime_ns of path, or None if it cannot be stat'ed"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _set_summary_preview(model, item_path):
+    """Set preview_path and has_images on a summary row"""
+    # Summaries written by generate_global_summary carry the preview
+    if 'preview_filename' in model:
+        preview = model['preview_filename']
+    else:
+        preview = _find_preview_image(item_path)
+    if preview:
+        model['preview_path'] = quote(f"{model['base_name']}/{preview}")
+        model['has_images'] = True
+    else:
+        model['preview_path'] = None
+        model['has_images'] = False
+
+def _version_names(version_file, item):
+    """Return [{'name': ...}] for the versions in a model's version file"""
+    versions = []
+    try:
+        version_data = load_json_cached(version_file)
+        # Falls version_data eine Liste ist, alle Namen extrahieren, sonst nur einen
+        if isinstance(version_data, list):
+            for v in version_data:
+                if 'name' in v:
+                    versions.append({'name': v['name']})
+        elif isinstance(version_data, dict) and 'name' in version_data:
+            versions.append({'name': version_data['name']})
+    except Exception as e:
+        logger.error("Could not load version info for %s: %s", item, e)
+    return versions
+
+def _mark_summary_escaped(model):
+    """Wrap the fields all_models_summary.json stores pre-escaped in Markup.
+
+    generate_global_summary HTML-escapes model names and tags when it writes
+    the summary; Markup keeps the templates from escaping them a second time.
+    """
+    model['title'] = Markup(model.get('name', ''))
+    model['tags'] = [Markup(tag) for tag in model.get('tags', [])]
+
+def _resolve_model_file(entry, models_dir, hash_file):
+    """Return (model file relative to models_dir or None, new index entry).
+
+    Reuses the item's index entry while the hash file is unchanged and the
+    indexed file still exists; otherwise resolves it with find_model_file_path.
+    The new entry is None when the item has no hash file. The index itself is
+    not touched, so this is safe to call from worker threads.
+    """
+    try:
+        hash_mtime = os.stat(hash_file).st_mtime_ns
+    except OSError:
+        return None, None
+
+    if (entry and entry.get('hash_mtime_ns') == hash_mtime
+            and (entry.get('rel_path') is None
+                 or os.path.isfile(os.path.join(models_dir, entry['rel_path'])))):
+        return entry.get('rel_path'), entry
+
+    hash_data = load_json_cached(hash_file)
+    stored_hash = hash_data.get('hash_value')
+    stored_filename = hash_data.get('name') # This is the original filename, e.g., 'flux_dev.safetensors'
+    rel_path = None
+    if stored_hash and stored_filename:
+        rel_path = find_model_file_path(models_dir, stored_hash, stored_filename)
+    return rel_path, {'hash_mtime_ns': hash_mtime, 'rel_path': rel_path}
+
+def _scan_model_dir(item, item_path, models_dir, index_entry):
+    """Build the dashboard entry for one model folder in the direct scan.
+
+    Runs on metadata_executor threads, so it must not use url_for; the
+    preview is recorded as preview_path. models_dir is None when it is not
+    configured or missing. Returns (model_info, model files index entry);
+    index_entry is the item's entry from a snapshot of that index.
+    """
+    model_info = {
+        'name': item,
+        'path': item_path,
+        'has_metadata': False,
+        'has_images': False,
+        'files': [],
+        'title': item,
+        'author': 'Unknown',
+        'tags': [],
+        'preview_path': None
+    }
+
+    # Try to load metadata
+    metadata = {}
+    # load_json_cached stats the file anyway, so a missing file is found
+    # there instead of with a separate exists() probe
+    model_metadata_path = os.path.join(item_path, f'{item}_civitai_model.json')
+    try:
+        metadata = load_json_cached(model_metadata_path)
+        model_info['has_metadata'] = True
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error("Could not load metadata for %s: %s", item, e)
+    
+    if metadata:
+        # Escaped by the template, like every other raw field
+        model_info['title'] = metadata.get('name', item)
+        if metadata.get('creator') and metadata['creator'].get('name'):
+            model_info['author'] = metadata['creator']['name']
+        model_info['tags'] = list(metadata.get('tags', []))
+
+    # Robustly find local preview image
+    preview = _find_preview_image(item_path)
+    if preview:
+        model_info['preview_path'] = quote(f'{item}/{preview}')
+        model_info['has_images'] = True
+
+    # Get model files from the models directory
+    if models_dir:
+        model_hash_file = os.path.join(item_path, f'{item}_hash.json')
+        try:
+            rel_path, index_entry = _resolve_model_file(index_entry, models_dir, model_hash_file)
+            if rel_path:
+                model_info['files'].append(rel_path)
+        except Exception as e:
+            logger.error("Error finding model file for %s: %s", item, e)
+
+    return model_info, index_entry
+
+def _with_local_url(item, path_key, url_key, static_prefix, placeholder_url):
+    """Copy of a cached item with its local_static path replaced by a URL"""
+    result = {k: v for k, v in item.items() if k != path_key}
+    path = item.get(path_key)
+    result[url_key] = static_prefix + path if path else placeholder_url
+    return result
+
 def get_models_info():
     """Get information about all models for the dashboard."""
-    start_time = time.time()
-    print("DEBUG: get_models_info started.")
+    listing = _models_listing()
+    if not listing:
+        return listing
+    key = (_local_static_url_prefix(), url_for('static', filename='placeholder.png'))
+    view = _LISTING_URL_VIEWS.get(key)
+    if view is not None and view[0] is listing:
+        return view[1]
+    static_prefix, placeholder_url = key
+    models, model_type_counts, total_size_gb = listing
+    result = ([
+        _with_local_url(model, 'preview_path', 'preview_image_url', static_prefix, placeholder_url)
+        for model in models
+    ], model_type_counts, total_size_gb)
+    _LISTING_URL_VIEWS[key] = (listing, result)
+    return result
+
+def _models_listing():
+    """Dashboard listing with previews as preview_path relative to local_static.
+
+    The result is cached across requests, so it must not depend on the
+    request; get_models_info turns preview_path into preview_image_url.
+    """
+    start_time = time.perf_counter()
+    logger.debug("_models_listing started.")
     config = load_web_config(app.config['CONFIG_FILE'])
     output_dir = config.get('output_directory')
     models_dir = config.get('models_directory')
 
     if not output_dir or not os.path.exists(output_dir):
-        print("DEBUG: Output directory not configured or does not exist.")
+        logger.debug("Output directory not configured or does not exist.")
         return []
 
     summary_file_path = os.path.join(output_dir, 'all_models_summary.json')
     
     models = []
     # Try to load from the pre-generated summary file
-    if os.path.exists(summary_file_path):
-        print(f"DEBUG: Found summary file: {summary_file_path}")
+    try:
+        summary_mtime = os.stat(summary_file_path).st_mtime_ns
+    except OSError:
+        summary_mtime = None
+
+    if summary_mtime is not None:
+        cached = _MODELS_INFO_CACHE.get(summary_file_path)
+        if cached and cached[0] == summary_mtime:
+            return cached[1]
+        output_mtime = _mtime_ns(output_dir)
+        cooked = _load_cooked_models_info(output_dir, summary_mtime, output_mtime)
+        if cooked is not None:
+            _MODELS_INFO_CACHE[summary_file_path] = (summary_mtime, cooked)
+            return cooked
+
+        logger.debug("Found summary file: %s", summary_file_path)
         try:
-            with open(summary_file_path, 'r', encoding='utf-8') as f:
-                models = json.load(f)
-            print(f"DEBUG: Successfully loaded models from summary file. Count: {len(models)}")
-            
-            # Post-process models to add local preview image URLs and escape HTML
-            for model in models:
-                item = model['base_name'] # This is the sanitized name
-                # Ensure base_name is also HTML escaped for URL generation
-                model['base_name'] = html.escape(item)
-                item_path = os.path.join(output_dir, item)
-                local_images = [f for f in os.listdir(item_path) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))] if os.path.isdir(item_path) else []
-                previews_path = os.path.join(item_path, 'previews')
-                previews_images = [f for f in os.listdir(previews_path) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))] if os.path.isdir(previews_path) else []
-                if previews_images:
-                    model['preview_image_url'] = url_for('local_static_files', filename=f'{item}/previews/{sorted(previews_images)[0]}')
-                    model['has_images'] = True
-                elif local_images:
-                    model['preview_image_url'] = url_for('local_static_files', filename=f'{item}/{sorted(local_images)[0]}')
-                    model['has_images'] = True
-                else:
-                    model['preview_image_url'] = url_for('static', filename='placeholder.png')
-                    model['has_images'] = False
-
-                # Explicitly escape HTML for title and author
-                model['title'] = html.escape(model.get('name', ''))
-                model['author'] = html.escape(model.get('author', 'Unknown'))
-                model['tags'] = [html.escape(tag) for tag in model.get('tags', [])]
-
-                # Versionen aus _model_version.json lesen
-                model['versions'] = []
-                version_file = os.path.join(item_path, f"{item}_civitai_model_version.json")
-                if os.path.exists(version_file):
-                    try:
-                        with open(version_file, 'r', encoding='utf-8') as vf:
-                            version_data = json.load(vf)
-                            # Falls version_data eine Liste ist, alle Namen extrahieren, sonst nur einen
-                            if isinstance(version_data, list):
-                                for v in version_data:
-                                    if 'name' in v:
-                                        model['versions'].append({'name': v['name']})
-                            elif isinstance(version_data, dict) and 'name' in version_data:
-                                model['versions'].append({'name': version_data['name']})
-                    except Exception as e:
-                        print(f"ERROR: Could not load version info for {item}: {e}")
-
-            print(f"DEBUG: Finished post-processing models from summary file. Total time: {time.time() - start_time:.4f} seconds")
+            with open(summary_file_path, 'rb') as f:
+                # Rows are post-processed as they are parsed when ijson is available
+                rows = ijson.items(f, 'item', use_float=True) if ijson is not None else json.load(f)
+
+                # Post-process models to add local preview image URLs and escape HTML
+                version_mtimes = {}
+                for model in rows:
+                    item = model['base_name'] # This is the sanitized name
+                    item_path = os.path.join(output_dir, item)
+                    _set_summary_preview(model, item_path)
+
+                    # generate_global_summary stores name and tags HTML-escaped;
+                    # the rest is escaped by the template
+                    _mark_summary_escaped(model)
+                    model['author'] = model.get('author', 'Unknown')
+
+                    # Versionen aus _model_version.json lesen
+                    version_file = os.path.join(item_path, f"{item}_civitai_model_version.json")
+                    version_mtimes[item] = _mtime_ns(version_file)
+                    if version_mtimes[item] is not None:
+                        model['versions'] = _version_names(version_file, item)
+                    else:
+                        model['versions'] = []
+
+                    models.append(model)
+            logger.debug("Successfully loaded models from summary file. Count: %d", len(models))
+
+            logger.debug("Finished post-processing models from summary file. Total time: %.4f seconds", time.perf_counter() - start_time)
             
             # Calculate model type counts and total size
             model_type_counts = {}
@@ -351,85 +753,65 @@ def get_models_info():
                 total_size_kb += model.get('file_size', 0)
             total_size_gb = total_size_kb / (1024 * 1024) # Convert KB to GB
 
-            return models, model_type_counts, total_size_gb
+            result = (models, model_type_counts, total_size_gb)
+            _MODELS_INFO_CACHE[summary_file_path] = (summary_mtime, result)
+            # Previews are looked up again by _load_cooked_models_info, so
+            # legacy rows without preview_filename follow their directory
+            _write_cache_file(output_dir, 'models_info.json', {
+                'summary_mtime_ns': summary_mtime,
+                'output_mtime_ns': output_mtime,
+                'version_mtimes': version_mtimes,
+                'models': [
+                    {k: v for k, v in model.items() if k not in ('preview_path', 'has_images')}
+                    for model in models
+                ],
+                'type_counts': model_type_counts,
+                'total_size_gb': total_size_gb,
+            })
+            return result
         except Exception as e:
-            print(f"ERROR: Failed to load or parse summary file: {e}. Falling back to direct scan.")
+            logger.error("Failed to load or parse summary file: %s. Falling back to direct scan.", e)
             # Fallback to direct scan if summary file fails
-            pass
+            models = []
+
+    cached = _DIRECT_SCAN_CACHE.get(output_dir)
+    if (cached and cached[0] == os.stat(output_dir).st_mtime_ns
+            and time.monotonic() - cached[1] < DIRECT_SCAN_TTL):
+        return cached[2]
 
-    print("DEBUG: Performing direct scan of output directory (slower).")
+    logger.debug("Performing direct scan of output directory (slower).")
     # Fallback to original, slower logic if summary file is not available or fails
     try:
-        for item in os.listdir(output_dir):
-            # Exclude the _bin directory from being processed as a model
-            if item == '_bin':
-                continue
-            item_path = os.path.join(output_dir, item)
-            if os.path.isdir(item_path):
-                model_info = {
-                    'name': html.escape(item),
-                    'path': item_path,
-                    'has_metadata': False,
-                    'has_images': False,
-                    'files': [],
-                    'title': html.escape(item),
-                    'author': 'Unknown',
-                    'tags': [],
-                    'preview_image_url': url_for('static', filename='placeholder.png')
-                }
-
-                # Try to load metadata
-                metadata = {}
-                model_metadata_path = os.path.join(item_path, f'{item}_civitai_model.json')
-                if os.path.exists(model_metadata_path):
-                    try:
-                        with open(model_metadata_path, 'r') as f:
-                            metadata = json.load(f)
-                            model_info['has_metadata'] = True
-                    except Exception as e:
-                        print(f"ERROR: Could not load metadata for {item}: {e}")
-                
-                if metadata:
-                    model_info['title'] = metadata.get('name', item)
-                    # Explicitly escape HTML for title and author
-                    model_info['title'] = html.escape(model_info['title'])
-                    if metadata.get('creator') and metadata['creator'].get('name'):
-                        model_info['author'] = html.escape(metadata['creator']['name'])
-                    model_info['tags'] = [html.escape(tag) for tag in metadata.get('tags', [])]
-
-                # Robustly find local preview image
-                local_images = [f for f in os.listdir(item_path) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))]
-                previews_path = os.path.join(item_path, 'previews')
-                previews_images = [f for f in os.listdir(previews_path) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))] if os.path.isdir(previews_path) else []
-                if previews_images:
-                    model_info['preview_image_url'] = url_for('local_static_files', filename=f'{item}/previews/{sorted(previews_images)[0]}')
-                    model_info['has_images'] = True
-                elif local_images:
-                    model_info['preview_image_url'] = url_for('local_static_files', filename=f'{item}/{sorted(local_images)[0]}')
-                    model_info['has_images'] = True
-                else:
-                    model_info['preview_image_url'] = url_for('static', filename='placeholder.png')
-                    model_info['has_images'] = False
-
-                # Get model files from the models directory
-                if models_dir and os.path.exists(models_dir):
-                    model_hash_file = os.path.join(item_path, f'{item}_hash.json')
-                    if os.path.exists(model_hash_file):
-                        try:
-                            with open(model_hash_file, 'r') as f:
-                                hash_data = json.load(f)
-                                stored_hash = hash_data.get('hash_value')
-                                stored_filename = hash_data.get('name') # This is the original filename, e.g., 'flux_dev.safetensors'
-
-                                if stored_hash and stored_filename:
-                                    rel_path = find_model_file_path(models_dir, stored_hash, stored_filename)
-                                    if rel_path:
-                                        model_info['files'].append(rel_path)
-                        except Exception as e:
-                            print(f"ERROR: Error finding model file for {item}: {e}")
-
-                models.append(model_info)
-        
+        with _MODEL_FILES_INDEX_LOCK:
+            index_snapshot = dict(_model_files_index(output_dir))
+        # scandir reports the entry type from the listing, saving a stat per item
+        with os.scandir(output_dir) as it:
+            entries = list(it)
+        model_dirs = [e for e in entries if e.name not in ('_bin', '_cache') and e.is_dir()]
+        if not (models_dir and os.path.exists(models_dir)):
+            models_dir = None
+        # Model folders are independent; read them on the metadata pool so
+        # cold-cache disk reads overlap. map() keeps the directory order.
+        scanned = list(metadata_executor.map(
+            lambda e: _scan_model_dir(e.name, e.path, models_dir, index_snapshot.get(e.name)),
+            model_dirs))
+        models = [model_info for model_info, _ in scanned]
+
+        if models_dir:
+            with _MODEL_FILES_INDEX_LOCK:
+                files_index = _model_files_index(output_dir)
+                changed = False
+                for entry, (_, index_entry) in zip(model_dirs, scanned):
+                    if index_entry == index_snapshot.get(entry.name):
+                        continue
+                    changed = True
+                    if index_entry is None:
+                        files_index.pop(entry.name, None)
+                    else:
+                        files_index[entry.name] = index_entry
+                if changed:
+                    _save_model_files_index(output_dir, files_index)
+
         # Calculate model type counts and total size for direct scan
         model_type_counts = {}
         total_size_kb = 0
@@ -438,27 +820,53 @@ def get_models_info():
             total_size_kb += model.get('file_size', 0)
         total_size_gb = total_size_kb / (1024 * 1024) # Convert KB to GB
 
-        print(f"DEBUG: Finished direct scan. Total time: {time.time() - start_time:.4f} seconds")
-        return models, model_type_counts, total_size_gb
+        logger.debug("Finished direct scan. Total time: %.4f seconds", time.perf_counter() - start_time)
+        result = (models, model_type_counts, total_size_gb)
+        # Stat again: saving the file index may have just created _cache
+        _DIRECT_SCAN_CACHE[output_dir] = (os.stat(output_dir).st_mtime_ns, time.monotonic(), result)
+        return result
     except Exception as e:
-        print(f"ERROR: Error reading models directory during direct scan: {e}")
+        logger.error("Error reading models directory during direct scan: %s", e)
         return [], {}, 0
 
+# Upper bound on process ids answered by one /api/process-status request
+MAX_BATCH_STATUS_IDS = 100
+
+def _process_status_json(status):
+    """Serialize a ProcessStatus for the status endpoints"""
+    return {
+        'status': status.status,
+        'filename': status.filename,
+        'progress': status.progress,
+        'error': status.error,
+        'start_time': status.start_time.isoformat(),
+        'end_time': status.end_time.isoformat() if status.end_time else None
+    }
+
 @app.route('/api/process-status/<process_id>')
 def get_process_status(process_id):
     """Get the status of a processing task"""
     status = process_mgr.get_status(process_id)
     if status:
-        return jsonify({
-            'status': status.status,
-            'filename': status.filename,
-            'progress': status.progress,
-            'error': status.error,
-            'start_time': status.start_time.isoformat(),
-            'end_time': status.end_time.isoformat() if status.end_time else None
-        })
+        return jsonify(_process_status_json(status))
     return jsonify({'error': 'Process not found'}), 404
 
+@app.route('/api/process-status')
+def get_process_statuses():
+    """Get the status of several processing tasks in one request.
+
+    Takes repeated ``id`` query parameters and returns {process_id: status},
+    with null for unknown ids, so a page tracking many uploads polls once.
+    """
+    process_ids = request.args.getlist('id')
+    if len(process_ids) > MAX_BATCH_STATUS_IDS:
+        return jsonify({'error': f'At most {MAX_BATCH_STATUS_IDS} process ids per request'}), 400
+    result = {}
+    for process_id in process_ids:
+        status = process_mgr.get_status(process_id)
+        result[process_id] = _process_status_json(status) if status else None
+    return jsonify(result)
+
 @app.route('/api/active-processes')
 def get_active_processes():
     """Get all active processing tasks"""
@@ -540,10 +948,35 @@ def settings():
     
     return render_template('settings.html', form=form)
 
+def _save_upload(file, final_path):
+    """Write an uploaded file to final_path.
+
+    Werkzeug spools request files to a temporary file, which is copied with
+    os.sendfile so the bytes stay in the kernel. Streams without a file
+    descriptor fall back to copyfileobj with a 1MB buffer instead of
+    FileStorage.save's 16KB one.
+    """
+    src = file.stream
+    with open(final_path, 'wb') as dst:
+        offset = 0
+        try:
+            src_fd = src.fileno()
+            size = os.fstat(src_fd).st_size
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+            return
+        except (AttributeError, OSError):
+            # No descriptor (BytesIO) or sendfile unsupported for these files
+            src.seek(offset)
+            dst.seek(offset)
+        shutil.copyfileobj(src, dst, UPLOAD_COPY_BUFSIZE)
+
 @app.route('/upload', methods=['GET', 'POST'])
 def upload():
     """Model upload page"""
-    global processing_thread
     form = UploadForm()
     config = load_web_config(app.config['CONFIG_FILE'])
     app.config.update(config) # Update app.config with loaded values
@@ -553,10 +986,14 @@ def upload():
         return redirect(url_for('settings'))
     
     if form.validate_on_submit():
-        print(f"DEBUG: Starting upload process for {form.model_file.data.filename}")
-        if processing_thread and processing_thread.is_alive():
-            print("DEBUG: Processing thread already active, returning 409")
+        logger.debug("Starting upload process for %s", form.model_file.data.filename)
+        if _processing_active():
+            logger.debug("Processing thread already active, returning 409")
             return jsonify({'success': False, 'message': 'A process is already running.'}), 409
+        if process_mgr.pending_count() >= MAX_QUEUED_UPLOADS:
+            response = jsonify({'success': False, 'message': 'Too many uploads waiting to be processed, try again later.'})
+            response.headers['Retry-After'] = '30'
+            return response, 503
 
         file = form.model_file.data
         filename = secure_filename(file.filename)
@@ -565,13 +1002,16 @@ def upload():
         final_path = os.path.join(models_dir, filename)
 
         # Save the file directly to the models directory
-        print(f"DEBUG: Saving file to {final_path}")
-        file.save(final_path)
+        logger.debug("Saving file to %s", final_path)
+        _save_upload(file, final_path)
         
         # Add process to manager and queue processing
         process_id = process_mgr.add_process(filename)
         
         def process_upload(process_id: str, file_path: str, output_dir: Path, models_dir: Path, config: Dict):
+            # Imported on first use: the processing pipeline is only needed by
+            # upload and process-all jobs, not to serve pages
+            from civitai_manager.src.core.metadata_manager import process_single_file
             try:
                 process_mgr.update_status(process_id, 'processing', progress=0.0)
                 
@@ -588,9 +1028,8 @@ def upload():
                 )
                 
                 if success:
-                    process_mgr.update_status(process_id, 'processing', progress=0.5)
-                    # Update global summary
-                    generate_global_summary(Path(output_dir), Path(models_dir))
+                    # Update global summary once the current burst of uploads is done
+                    _schedule_summary(output_dir, models_dir)
                     process_mgr.update_status(process_id, 'completed', progress=1.0)
                 else:
                     process_mgr.update_status(process_id, 'failed', 
@@ -599,7 +1038,7 @@ def upload():
             except Exception as e:
                 error_msg = f"Error processing file: {str(e)}"
                 process_mgr.update_status(process_id, 'failed', error=error_msg)
-                logging.error(f"Error processing {filename}: {error_msg}")
+                logger.error("Error processing %s: %s", filename, error_msg)
 
         # Queue the processing
         process_mgr.queue_process(
@@ -624,17 +1063,17 @@ def upload():
 
     return render_template('upload.html', form=form)
 
-@app.route('/process-all')
+@app.route('/process-all', methods=['POST'])
 def process_all():
     """Process all models in the configured directory"""
-    global processing_thread, cancel_processing_flag
+    global processing_future
     config = load_web_config(app.config['CONFIG_FILE'])
     
     if not is_configured(app):
         return jsonify({'error': 'Configuration not set'}), 400
     
     def process_all_models_task(): # Renamed to avoid conflict with outer function
-        global processing_thread, cancel_processing_flag
+        from civitai_manager.src.core.metadata_manager import process_directory
         cancel_processing_flag.clear() # Clear the flag at the start of a new process
         try:
             models_dir = Path(config['models_directory'])
@@ -651,161 +1090,138 @@ def process_all():
                 images_per_post_limit=int(config.get('images_per_post_limit', 0) or 0),
                 cancel_flag=cancel_processing_flag # Pass the flag
             )
-            # Ensure thread is cleared and flag reset immediately after processing
-            processing_thread = None
-            cancel_processing_flag.clear()
-
             if not cancel_processing_flag.is_set(): # Only generate summary if not cancelled
                 generate_global_summary(output_dir, models_dir)
         except Exception as e:
-            print(f"Error processing all models: {e}")
+            logger.exception("Error processing all models: %s", e)
         finally:
-            processing_thread = None # Clear the thread reference when done
             cancel_processing_flag.clear() # Clear the flag
     
-    if processing_thread and processing_thread.is_alive():
+    if _processing_active():
         return jsonify({'message': 'Processing already in progress'}), 409
 
-    processing_thread = threading.Thread(target=process_all_models_task)
-    processing_thread.daemon = True
-    processing_thread.start()
+    processing_future = processing_executor.submit(process_all_models_task)
     
     return jsonify({'message': 'Processing started'})
 
-@app.route('/cancel-processing')
+@app.route('/cancel-processing', methods=['POST'])
 def cancel_processing():
-    global processing_thread, cancel_processing_flag
-    if processing_thread and processing_thread.is_alive():
+    if _processing_active():
         cancel_processing_flag.set() # Set the flag to signal cancellation
+        processing_future.cancel() # Drops the task if it has not started yet
         return jsonify({'message': 'Cancellation requested'})
     else:
         return jsonify({'message': 'No active processing to cancel'}), 400
 
 
-@app.route('/model/<model_name>')
-def model_detail(model_name):
-    """Show detailed information about a specific model"""
-    start_time = time.time()
-    print(f"DEBUG: Entering model_detail for {model_name} at {start_time}")
+def _coalesced(key, fn, *args):
+    """Call fn(*args), sharing one call between concurrent callers with the same key.
 
-    config = load_web_config(app.config['CONFIG_FILE'])
-    output_dir = config.get('output_directory')
-    output_dir = config.get('output_directory')
+    The first caller computes the result; callers arriving while it runs wait
+    for and receive the same object (or exception) instead of repeating the
+    work.
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = Future()
+    if not owner:
+        return future.result()
 
-    if not is_configured(app):
-        return redirect(url_for('settings'))
+    try:
+        result = fn(*args)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
 
-    model_path = os.path.join(output_dir, model_name)
-    if not os.path.exists(model_path):
-        flash('Model not found!', 'error')
-        return redirect(url_for('index'))
+def _load_model_detail(model_name, model_path):
+    """Load the metadata, version and user posts model_detail renders.
 
+    Returns (metadata, version_data, user_posts). The result is cached and
+    shared between requests, so it must not be mutated. Local files are
+    given as local_path relative to local_static (None when missing).
+    """
     metadata = {}
     version_data = {}
-    model_files = []
+    user_posts = []
 
     try:
-        # Load model metadata
-        load_metadata_start = time.time()
+        # Load model and version metadata concurrently
         model_metadata_path = os.path.join(model_path, f'{model_name}_civitai_model.json')
-        if os.path.exists(model_metadata_path):
-            try:
-                with open(model_metadata_path, 'r') as f:
-                    metadata = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"ERROR: JSONDecodeError when loading model metadata from {model_metadata_path}: {e}")
-                metadata = {} # Ensure metadata is empty on error
-            except Exception as e:
-                print(f"ERROR: Unexpected error when loading model metadata from {model_metadata_path}: {e}")
-                metadata = {} # Ensure metadata is empty on error
-        print(f"DEBUG: Loaded model metadata in {time.time() - load_metadata_start:.4f} seconds")
-
-        # Load version metadata
-        load_version_start = time.time()
         version_metadata_path = os.path.join(model_path, f'{model_name}_civitai_model_version.json')
-        if os.path.exists(version_metadata_path):
-            try:
-                with open(version_metadata_path, 'r') as f:
-                    version_data = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"ERROR: JSONDecodeError when loading version metadata from {version_metadata_path}: {e}")
-                version_data = {} # Ensure version_data is empty on error
-            except Exception as e:
-                print(f"ERROR: Unexpected error when loading version metadata from {version_metadata_path}: {e}")
-                version_data = {} # Ensure version_data is empty on error
-        print(f"DEBUG: Loaded version metadata in {time.time() - load_version_start:.4f} seconds")
+        metadata_future = metadata_executor.submit(_load_metadata_file, model_metadata_path, 'model')
+        version_future = metadata_executor.submit(_load_metadata_file, version_metadata_path, 'version')
+        metadata = metadata_future.result()
+        version_data = version_future.result()
         
         if metadata and 'modelVersions' in metadata and version_data:
-            version_id = version_data.get('id')
-            for v in metadata.get('modelVersions', []):
-                if v.get('id') == version_id:
-                    temp_version = v.copy()
-                    temp_version.update(version_data)
-                    version_data = temp_version
-                    break
+            versions_by_id = {v.get('id'): v for v in metadata.get('modelVersions', [])}
+            matched_version = versions_by_id.get(version_data.get('id'))
+            if matched_version:
+                version_data = {**matched_version, **version_data}
+        # The loaded metadata is shared through the JSON cache; only modify copies
+        version_data = dict(version_data)
 
         # Process images
-        process_images_start = time.time()
         if version_data.get('images'):
+            # One directory listing each instead of a stat per image
+            preview_files = _list_file_names(os.path.join(model_path, 'previews'))
+            legacy_files = _list_file_names(model_path)
+            images = []
             for i, image_data in enumerate(version_data['images']):
                 if image_data.get('type') == 'video':
                     ext = '.mp4'
                 else:
                     url = image_data.get('url', '')
-                    ext = Path(url.split('?')[0]).suffix if url else '.jpeg'
-
-                # Prefer new previews/ subfolder
-                image_filename = f"{model_name}/previews/{model_name}_preview_{i}{ext}"
-                full_image_path = os.path.join(output_dir, image_filename)
-                # Fallback to legacy root if not found
-                if not os.path.exists(full_image_path):
-                    legacy_image_filename = f"{model_name}/{model_name}_preview_{i}{ext}"
-                    legacy_full_image_path = os.path.join(output_dir, legacy_image_filename)
-                    if os.path.exists(legacy_full_image_path):
-                        image_filename = legacy_image_filename
-                        full_image_path = legacy_full_image_path
-                
-                if os.path.exists(full_image_path):
-                    version_data['images'][i]['local_url'] = url_for('local_static_files', filename=image_filename)
+                    ext = os.path.splitext(url.split('?')[0])[1] if url else '.jpeg'
+
+                # Prefer new previews/ subfolder, fall back to legacy root
+                preview_name = f"{model_name}_preview_{i}{ext}"
+                if preview_name in preview_files:
+                    local_path = quote(f"{model_name}/previews/{preview_name}")
+                elif preview_name in legacy_files:
+                    local_path = quote(f"{model_name}/{preview_name}")
                 else:
-                    version_data['images'][i]['local_url'] = url_for('static', filename='placeholder.png')
-        print(f"DEBUG: Processed images in {time.time() - process_images_start:.4f} seconds")
+                    local_path = None
+                images.append({**image_data, 'local_path': local_path})
+            version_data['images'] = images
 
     # Load user posts if downloaded (scan user_posts/<post_xxx>)
         posts_dir = os.path.join(model_path, 'user_posts')
-        user_posts = []
         if os.path.isdir(posts_dir):
-            SUPPORTED_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif')
-            SUPPORTED_VIDEO_EXTS = ('.mp4', '.webm', '.ogg')
-            for entry in sorted(os.listdir(posts_dir)):
-                if not entry.startswith('post_'):
-                    continue
+            with os.scandir(posts_dir) as it:
+                post_dirs = sorted(e.name for e in it if e.name.startswith('post_') and e.is_dir())
+            for entry in post_dirs:
                 pdir = os.path.join(posts_dir, entry)
-                if not os.path.isdir(pdir):
-                    continue
+                # One listing per post; post.json and the media sidecars are looked up in it
+                post_files = _list_file_names(pdir)
                 # read post.json if exists
                 post_meta = {}
-                post_json = os.path.join(pdir, 'post.json')
-                if os.path.exists(post_json):
+                if 'post.json' in post_files:
                     try:
-                        with open(post_json, 'r') as pf:
-                            post_meta = json.load(pf)
+                        post_meta = load_json_file(os.path.join(pdir, 'post.json'))
                     except Exception:
                         post_meta = {}
                 # collect media files
                 media = []
-                for fname in sorted(os.listdir(pdir)):
+                for fname in sorted(post_files):
                     if fname == 'post.json':
                         continue
                     lower = fname.lower()
-                    if lower.endswith(SUPPORTED_IMAGE_EXTS + SUPPORTED_VIDEO_EXTS):
+                    if lower.endswith(USER_POST_MEDIA_EXTS):
                         rel_path = f"{model_name}/user_posts/{entry}/{fname}"
-                        meta_path = os.path.join(pdir, Path(fname).with_suffix('.json').name)
+                        meta_name = os.path.splitext(fname)[0] + '.json'
                         meta = {}
-                        if os.path.exists(meta_path):
+                        if meta_name in post_files:
                             try:
-                                with open(meta_path, 'r') as mf:
-                                    meta = json.load(mf)
+                                meta = load_json_file(os.path.join(pdir, meta_name))
                             except Exception:
                                 meta = {}
                         utype = 'video' if lower.endswith(SUPPORTED_VIDEO_EXTS) else 'image'
@@ -861,7 +1277,7 @@ def model_detail(model_name):
                                 push(rr)
                         base_model_top = meta.get('baseModel') if isinstance(meta, dict) else None
                         media.append({
-                            'local_url': url_for('local_static_files', filename=rel_path),
+                            'local_path': quote(rel_path),
                             'type': utype,
                             'meta': meta_obj or meta,
                             'resources': merged_resources,
@@ -873,45 +1289,129 @@ def model_detail(model_name):
                     'meta': post_meta,
                     'media': media,
                 })
-        # Apply pagination to user_posts
-        posts_page = request.args.get('posts_page', default=1, type=int) or 1
-        posts_per_page = 12
-        posts_total = len(user_posts)
-        posts_total_pages = (posts_total + posts_per_page - 1) // posts_per_page if posts_total else 0
-        if user_posts:
-            start = (posts_page - 1) * posts_per_page
-            end = start + posts_per_page
-            version_data['user_posts'] = user_posts[start:end]
-
         # Fallback for metadata
         if not metadata:
-            fallback_metadata_start = time.time()
-            model_info_path = os.path.join(model_path, 'model_info.json')
-            if os.path.exists(model_info_path):
-                with open(model_info_path, 'r') as f:
-                    metadata = json.load(f)
-            print(f"DEBUG: Loaded fallback metadata in {time.time() - fallback_metadata_start:.4f} seconds")
-
-        # Find model files
-        find_files_start = time.time()
-        if version_data:
-            models_dir = config.get('models_directory')
-            file_info = version_data.get('files', [])
-            if models_dir and os.path.exists(models_dir) and file_info:
-                stored_hash = file_info[0].get('hashes', {}).get('SHA256')
-                stored_filename = file_info[0].get('name') # This is the original filename, e.g., 'flux_dev.safetensors'
-
-                if stored_hash and stored_filename:
-                    expected_path = os.path.join(models_dir, stored_filename)
-                    if os.path.exists(expected_path): # Only check for existence, trust the hash from _hash.json
-                        model_files.append(os.path.relpath(expected_path, models_dir))
-                    # No fallback to find_model_file_path here, as it's slow and we have the filename
-        print(f"DEBUG: Found model files in {time.time() - find_files_start:.4f} seconds")
+            try:
+                metadata = load_json_cached(os.path.join(model_path, 'model_info.json'))
+            except FileNotFoundError:
+                pass
 
     except Exception as e:
-        print(f"Error reading model details for {model_name}: {e}")
+        logger.error("Error reading model details for %s: %s", model_name, e)
+    return metadata, version_data, user_posts
 
-    print(f"DEBUG: Rendering model_detail.html for {model_name}. Total time: {time.time() - start_time:.4f} seconds")
+def _model_files_for(version_data, models_dir):
+    """Return the model's file relative to models_dir as a list (empty if absent)"""
+    model_files = []
+    try:
+        file_info = version_data.get('files', [])
+        if models_dir and os.path.exists(models_dir) and file_info:
+            stored_hash = file_info[0].get('hashes', {}).get('SHA256')
+            stored_filename = file_info[0].get('name') # This is the original filename, e.g., 'flux_dev.safetensors'
+
+            if stored_hash and stored_filename:
+                expected_path = os.path.join(models_dir, stored_filename)
+                if os.path.exists(expected_path): # Only check for existence, trust the hash from _hash.json
+                    model_files.append(os.path.relpath(expected_path, models_dir))
+                # No fallback to find_model_file_path here, as it's slow and we have the filename
+    except Exception as e:
+        logger.error("Error finding model file: %s", e)
+    return model_files
+
+def _model_detail_stamp(model_name, model_path):
+    """mtimes of everything _load_model_detail reads, to validate its cached result"""
+    paths = (
+        model_path,
+        os.path.join(model_path, f'{model_name}_civitai_model.json'),
+        os.path.join(model_path, f'{model_name}_civitai_model_version.json'),
+        os.path.join(model_path, 'model_info.json'),
+        os.path.join(model_path, 'previews'),
+    )
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    # Each downloaded post directory, which changes when media is added, and
+    # the JSON files in it (post.json and the media sidecars), which can be
+    # rewritten in place without touching the directory
+    try:
+        with os.scandir(os.path.join(model_path, 'user_posts')) as it:
+            post_dirs = sorted((e.name, e.path, e.stat().st_mtime_ns) for e in it)
+    except OSError:
+        post_dirs = []
+    for name, path, mtime in post_dirs:
+        stamp.append((name, mtime))
+        try:
+            with os.scandir(path) as it:
+                stamp.extend(sorted((e.name, e.stat().st_mtime_ns)
+                                    for e in it if e.name.endswith('.json')))
+        except OSError:
+            pass
+    return tuple(stamp)
+
+@app.route('/model/<model_name>')
+def model_detail(model_name):
+    """Show detailed information about a specific model"""
+    start_time = time.perf_counter()
+
+    config = load_web_config(app.config['CONFIG_FILE'])
+    output_dir = config.get('output_directory')
+
+    if not is_configured(app):
+        return redirect(url_for('settings'))
+
+    # Model names are single directory names; '..' must not reach outside
+    model_path = safe_join(output_dir, model_name)
+    if model_path is None:
+        abort(404)
+    if not os.path.exists(model_path):
+        flash('Model not found!', 'error')
+        return redirect(url_for('index'))
+
+    stamp = _model_detail_stamp(model_name, model_path)
+    with _MODEL_DETAIL_CACHE_LOCK:
+        cached = _MODEL_DETAIL_CACHE.get(model_path)
+        if cached is not None and cached[0] == stamp:
+            _MODEL_DETAIL_CACHE.move_to_end(model_path)
+    if cached is not None and cached[0] == stamp:
+        detail = cached[1]
+    else:
+        detail = _coalesced(model_path, _load_model_detail, model_name, model_path)
+        with _MODEL_DETAIL_CACHE_LOCK:
+            _MODEL_DETAIL_CACHE[model_path] = (stamp, detail)
+            _MODEL_DETAIL_CACHE.move_to_end(model_path)
+            while len(_MODEL_DETAIL_CACHE) > MODEL_DETAIL_CACHE_SIZE:
+                _MODEL_DETAIL_CACHE.popitem(last=False)
+    metadata, version_data, user_posts = detail
+    model_files = _model_files_for(version_data, config.get('models_directory'))
+    static_prefix = _local_static_url_prefix()
+    placeholder_url = url_for('static', filename='placeholder.png')
+    if version_data.get('images'):
+        version_data = {**version_data, 'images': [
+            _with_local_url(image, 'local_path', 'local_url', static_prefix, placeholder_url)
+            for image in version_data['images']
+        ]}
+
+    # Apply pagination to user_posts
+    posts_page = request.args.get('posts_page', default=1, type=int) or 1
+    posts_per_page = 12
+    posts_total = len(user_posts)
+    posts_total_pages = (posts_total + posts_per_page - 1) // posts_per_page if posts_total else 0
+    if user_posts:
+        start = (posts_page - 1) * posts_per_page
+        end = start + posts_per_page
+        version_data = {**version_data, 'user_posts': [
+            {**post, 'media': [
+                _with_local_url(media, 'local_path', 'local_url', static_prefix, placeholder_url)
+                for media in post['media']
+            ]}
+            for post in user_posts[start:end]
+        ]}
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Loaded model_detail data for %s in %.4f seconds", model_name, time.perf_counter() - start_time)
 
     likes_fill_width = 0
     if version_data and version_data.get('stats'):
@@ -930,6 +1430,66 @@ def model_detail(model_name):
                          posts_current_page=posts_page,
                          posts_total_pages=posts_total_pages)
 
+def _precompressed_variant(directory, filename):
+    """Return filename + '.gz' if an up-to-date gzip sibling of filename exists"""
+    if not filename.endswith('.json'):
+        return None
+    path = safe_join(directory, filename)
+    if path is None:
+        return None
+    try:
+        if os.stat(path + '.gz').st_mtime_ns < os.stat(path).st_mtime_ns:
+            return None
+    except OSError:
+        return None
+    return filename + '.gz'
+
+def _send_local_file(directory, filename, max_age=None):
+    """Serve a file below directory without copying it through Python.
+
+    send_from_directory opens the file and hands it to the WSGI server's
+    ``wsgi.file_wrapper`` with direct passthrough, so gunicorn can stream it
+    with sendfile(2); Range and conditional requests are still handled.
+    Where the generic FileWrapper is used instead, its 8KB default read
+    size is raised to STATIC_BLKSIZE to cut syscalls per file.
+
+    JSON files with an up-to-date ``.gz`` sibling (written for
+    all_models_summary.json) are sent precompressed to clients that
+    accept gzip.
+    """
+    try:
+        gz_filename = _precompressed_variant(directory, filename)
+        if gz_filename and 'gzip' in request.accept_encodings:
+            response = send_from_directory(directory, gz_filename, mimetype='application/json', max_age=max_age)
+            response.content_encoding = 'gzip'
+        else:
+            response = send_from_directory(directory, filename, max_age=max_age)
+        if gz_filename:
+            # Both variants answer this URL, so shared caches must key on it
+            response.vary.add('Accept-Encoding')
+    except Exception as e:
+        logger.debug("Error serving file %s from %s: %s", filename, directory, e)
+        return '', 404
+
+    # Range responses wrap the file wrapper in a _RangeWrapper
+    wrapper = getattr(response.response, 'iterable', response.response)
+    if isinstance(wrapper, FileWrapper):
+        wrapper.buffer_size = app.config['STATIC_BLKSIZE']
+    return response
+
+def _accel_redirect(directory, filename, prefix):
+    """Hand a file below directory to nginx via X-Accel-Redirect.
+
+    The file is checked here, so nginx's internal location only has to map
+    prefix to directory; the response body is empty.
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        return '', 404
+    response = app.response_class(mimetype='application/octet-stream')
+    response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(filename)
+    return response
+
 @app.route('/local_static/<path:filename>')
 def local_static_files(filename):
     """Serve static files from the output directory"""
@@ -939,11 +1499,7 @@ def local_static_files(filename):
     if not output_dir:
         return '', 404
 
-    try:
-        return send_from_directory(output_dir, filename)
-    except Exception as e:
-        print(f"DEBUG: Error serving file {filename} from {output_dir}: {e}")
-        return '', 404
+    return _send_local_file(output_dir, filename, max_age=app.config['LOCAL_STATIC_MAX_AGE'])
 
 @app.route('/local_models/<path:filename>')
 def local_model_files(filename):
@@ -954,11 +1510,10 @@ def local_model_files(filename):
     if not models_dir:
         return '', 404
 
-    try:
-        return send_from_directory(models_dir, filename)
-    except Exception as e:
-        print(f"DEBUG: Error serving file {filename} from {models_dir}: {e}")
-        return '', 404
+    accel_prefix = app.config['MODELS_ACCEL_PREFIX']
+    if accel_prefix:
+        return _accel_redirect(models_dir, filename, accel_prefix)
+    return _send_local_file(models_dir, filename)
 
 @app.route('/model/<model_name>/delete', methods=['POST'])
 def delete_model(model_name):
@@ -975,9 +1530,8 @@ def delete_model(model_name):
         original_filename = None
         hash_file_path = model_output_path / f'{model_name}_hash.json'
         if hash_file_path.exists():
-            with open(hash_file_path, 'r') as f:
-                hash_data = json.load(f)
-                original_filename = hash_data.get('filename')
+            hash_data = load_json_cached(hash_file_path)
+            original_filename = hash_data.get('filename')
 
         bin_dir = output_dir / '_bin'
         bin_dir.mkdir(exist_ok=True)
@@ -1005,7 +1559,7 @@ def delete_model(model_name):
             manager.remove_processed_file(models_dir / original_filename)
             manager.save_processed_files()
 
-        generate_global_summary(output_dir, models_dir)
+        _schedule_summary(output_dir, models_dir)
 
     else:
         flash(f'Model {model_name} not found in output directory.', 'error')
@@ -1029,21 +1583,108 @@ def clear_bin():
 @app.route('/api/models')
 def api_models():
     """API endpoint to get models information"""
+    global _MODELS_JSON_CACHE
     models = get_models_info()
-    return jsonify(models)
+    cached_models, body, etag = _MODELS_JSON_CACHE
+    if cached_models is not models:
+        body = app.json.dumps(models).encode()
+        etag = hashlib.sha1(body).hexdigest()
+        _MODELS_JSON_CACHE = (models, body, etag)
+    # Polling clients revalidate and get a 304 while the listing is unchanged.
+    # Flask-Compress appends ":<encoding>" to the ETag of compressed bodies;
+    # those tags are matched here too, so a 304 never compresses the body.
+    matched = next((tag for tag in request.if_none_match.as_set()
+                    if tag.split(':', 1)[0] == etag), None)
+    if matched:
+        response = app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/refresh', methods=['POST'])
+def api_refresh():
+    """Drop the cached model listing so the next request rebuilds it.
+
+    The summary-based listing is kept, in memory and in
+    output_dir/_cache/models_info.json, while the summary file's mtime is
+    unchanged, and the direct scan is reused for up to DIRECT_SCAN_TTL
+    seconds; this lets a client pick up metadata edited by hand right away.
+    """
+    global _MODELS_JSON_CACHE
+    _MODELS_INFO_CACHE.clear()
+    _DIRECT_SCAN_CACHE.clear()
+    _LISTING_URL_VIEWS.clear()
+    _MODELS_JSON_CACHE = (None, b'', '')
+    _PREVIEW_CACHE.clear()
+    with _MODEL_DETAIL_CACHE_LOCK:
+        _MODEL_DETAIL_CACHE.clear()
+    output_dir = load_web_config(app.config['CONFIG_FILE']).get('output_directory')
+    if output_dir:
+        try:
+            os.unlink(os.path.join(output_dir, '_cache', 'models_info.json'))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Could not remove cached model listing: %s", e)
+    return jsonify({'message': 'Model listing refreshed'})
 
 @app.route('/api/status')
 def api_status():
     """API endpoint to get processing status"""
-    global processing_thread
     config = load_web_config(app.config['CONFIG_FILE'])
     return jsonify({
         'configured': is_configured(app),
         'models_directory': config.get('models_directory', ''),
         'output_directory': config.get('output_directory', ''),
-        'is_processing': processing_thread and processing_thread.is_alive()
+        'is_processing': _processing_active(),
+        'queued_uploads': process_mgr.pending_count()
     })
 
+def enable_queued_logging():
+    """Route root logging through a queue drained by a background listener.
+
+    Request threads then only enqueue records instead of writing to stderr
+    while holding the handler lock. The root logger's current handlers (or
+    a stderr handler if there are none) are moved behind the listener.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, QueueHandler) for h in root.handlers):
+        return
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    for handler in handlers:
+        root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+# Request threads for run_server, matching the gunicorn command in the Dockerfile
+SERVER_THREADS = 8
+
+def run_server(host='0.0.0.0', port=5000, debug=False):
+    """Serve the app outside Docker/gunicorn.
+
+    Uses waitress when it is installed: a single process (so the in-memory
+    processing state stays consistent) with SERVER_THREADS request threads.
+    Otherwise, and always with debug, falls back to the threaded Werkzeug
+    development server.
+    """
+    if not debug:
+        try:
+            from waitress import serve
+        except ImportError:
+            serve = None
+        if serve is not None:
+            serve(app, host=host, port=port, threads=SERVER_THREADS)
+            return
+    app.run(host=host, port=port, debug=debug, threaded=True)
+
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    enable_queued_logging()
+    run_server(port=5000, debug=True)
\ No newline at end of file
@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from civitai_manager.web_app import app
+    from civitai_manager.web_app import enable_queued_logging, run_server
     
     if __name__ == "__main__":
         print("=" * 60)
@@ -21,7 +21,10 @@ try:
         print("Press Ctrl+C to stop")
         print("=" * 60)
         
-        app.run(host='0.0.0.0', port=8080, debug=True)
+        enable_queued_logging()
+        # The auto-reloading debugger only on request (FLASK_DEBUG=1)
+        run_server(host='0.0.0.0', port=8080,
+                   debug=os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes'))
         
 except ImportError as e:
     print("Error importing web application:")
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 import hashlib
+import json
 from civitai_manager.src.core.file_processor import (
     extract_metadata,
     extract_hash,
@@ -44,19 +45,30 @@ def test_extract_hash(temp_dir, sample_safetensors):
     
     # Verify the hash is correct
     with open(sample_safetensors, 'rb') as f:
-        content = f.read()
-        expected_hash = hashlib.sha256(content).hexdigest()
+        expected_hash = hashlib.file_digest(f, 'sha256').hexdigest()
     assert hash_value == expected_hash
     
     # Check if hash file was created
     hash_file = output_dir / f"{sample_safetensors.stem}_hash.json"
     assert hash_file.exists()
+    assert hash_file.read_text() == json.dumps(
+        {'hash_value': expected_hash, 'algorithm': 'SHA256'}, indent=4)
     
     # Test with non-existent file
     non_existent = temp_dir / 'nonexistent.safetensors'
     hash_value = extract_hash(non_existent, output_dir)
     assert hash_value is None
 
+def test_extract_hash_reuses_cached_hash(temp_dir, sample_safetensors, mocker):
+    """Test an unchanged file is hashed once across repeated extractions"""
+    from civitai_manager.src.utils import string_utils
+    sha = mocker.spy(string_utils, 'calculate_sha256')
+
+    first = extract_hash(sample_safetensors, temp_dir / 'a')
+    assert extract_hash(sample_safetensors, temp_dir / 'b') == first
+    assert sha.call_count == 1
+    assert (temp_dir / 'b' / f"{sample_safetensors.stem}_hash.json").exists()
+
 def test_fetch_version_data(requests_mock, temp_dir, sample_safetensors, mock_civitai_responses):
     """Test fetching version data from Civitai API"""
     output_dir = temp_dir / 'output'
@@ -147,3 +159,31 @@ def test_process_single_file(requests_mock, temp_dir, sample_safetensors, mock_c
         skip_images=True
     )
     assert success is False
+
+def test_batch_processor_skips_files_after_cancel(temp_dir, mocker):
+    """Test queued files are skipped once the shared cancel event is set"""
+    import threading
+    from civitai_manager.src.core import batch_processor
+
+    cancel = threading.Event()
+
+    def process(file_path, *args):
+        cancel.set()
+        return True
+
+    mocker.patch.object(batch_processor, 'process_single_file', side_effect=process)
+    processor = batch_processor.BatchProcessor(max_workers=1, cancel_event=cancel)
+    files = [temp_dir / f'model_{i}.safetensors' for i in range(3)]
+
+    metrics = processor.process_files(files, temp_dir / 'output')
+    assert metrics.processed_files == 1
+    assert metrics.skipped_files == 2
+
+def test_batch_processor_pool_matches_workers():
+    """Test the shared session pools one connection per worker and retries"""
+    from civitai_manager.src.core.batch_processor import BatchProcessor
+
+    processor = BatchProcessor(max_workers=16)
+    adapter = processor.session.get_adapter('https://civitai.com/api/v1/models/1')
+    assert adapter._pool_maxsize == 16
+    assert 429 in adapter.max_retries.status_forcelist
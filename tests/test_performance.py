@@ -2,6 +2,7 @@ import pytest
 import time
 import json
 import hashlib
+import shutil
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from civitai_manager.src.core.metadata_manager import process_directory, find_safetensors_files
@@ -23,15 +24,31 @@ def create_dummy_safetensors(path: Path, size_mb: int = 1):
         f.write(header_length.to_bytes(8, 'little'))
         # Write header
         f.write(header)
-        # Write dummy tensor data to reach desired size
-        remaining_size = (size_mb * 1024 * 1024) - header_length - 8
-        chunk_size = 1024 * 1024  # 1MB chunks
-        while remaining_size > 0:
-            write_size = min(chunk_size, remaining_size)
-            f.write(b'0' * write_size)  # Use '0' instead of 'x' for consistent hash
-            remaining_size -= write_size
-
-def test_large_file_processing(requests_mock, temp_dir, mock_civitai_responses):
+        # Extend to the desired size with zero tensor data; the file stays
+        # sparse, so nothing is allocated and the hash is still consistent
+        f.truncate(size_mb * 1024 * 1024)
+
+@pytest.fixture(scope="session")
+def dummy_safetensors(tmp_path_factory):
+    """Copy a dummy safetensors file into place, generating each size once
+
+    Returns the SHA-256 of the copy, which is the same for every file of a size.
+    """
+    templates = {}
+
+    def make(path: Path, size_mb: int = 1) -> str:
+        if size_mb not in templates:
+            template = tmp_path_factory.mktemp('dummy') / f'{size_mb}mb.safetensors'
+            create_dummy_safetensors(template, size_mb=size_mb)
+            templates[size_mb] = (template, calculate_sha256(template))
+        template, hash_value = templates[size_mb]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(template, path)
+        return hash_value
+
+    return make
+
+def test_large_file_processing(requests_mock, temp_dir, mock_civitai_responses, dummy_safetensors):
     """Test processing of large files"""
     models_dir = temp_dir / 'models'
     output_dir = temp_dir / 'output'
@@ -40,8 +57,7 @@ def test_large_file_processing(requests_mock, temp_dir, mock_civitai_responses):
     
     # Create a 100MB test file
     test_file = models_dir / 'large_model.safetensors'
-    create_dummy_safetensors(test_file, size_mb=100)
-    hash_value = calculate_sha256(test_file)
+    hash_value = dummy_safetensors(test_file, size_mb=100)
     model_id = mock_civitai_responses['version']['modelId']
 
     requests_mock.get(f"https://civitai.com/api/v1/model-versions/by-hash/{hash_value}", json=mock_civitai_responses['version'])
@@ -67,7 +83,7 @@ def test_large_file_processing(requests_mock, temp_dir, mock_civitai_responses):
     memory_mb = process.memory_info().rss / (1024 * 1024)
     assert memory_mb < 200  # Memory usage should stay under 200MB
 
-def test_concurrent_processing(requests_mock, temp_dir, mock_civitai_responses):
+def test_concurrent_processing(requests_mock, temp_dir, mock_civitai_responses, dummy_safetensors):
     """Test processing multiple files concurrently"""
     models_dir = temp_dir / 'models'
     output_dir = temp_dir / 'output'
@@ -78,9 +94,8 @@ def test_concurrent_processing(requests_mock, temp_dir, mock_civitai_responses):
     test_files = []
     for i in range(5):
         file_path = models_dir / f'model_{i}.safetensors'
-        create_dummy_safetensors(file_path, size_mb=10)
+        hash_value = dummy_safetensors(file_path, size_mb=10)
         test_files.append(file_path)
-        hash_value = calculate_sha256(file_path)
         model_id = mock_civitai_responses['version']['modelId']
         requests_mock.get(f"https://civitai.com/api/v1/model-versions/by-hash/{hash_value}", json=mock_civitai_responses['version'])
         requests_mock.get(f"https://civitai.com/api/v1/models/{model_id}", json=mock_civitai_responses['model'])
@@ -101,7 +116,7 @@ def test_concurrent_processing(requests_mock, temp_dir, mock_civitai_responses):
     processed_files = list(output_dir.glob('**/*_metadata.json'))
     assert len(processed_files) == len(test_files)
 
-def test_stress_test(requests_mock, temp_dir, mock_civitai_responses):
+def test_stress_test(requests_mock, temp_dir, mock_civitai_responses, dummy_safetensors):
     """Stress test with many small files"""
     models_dir = temp_dir / 'models'
     output_dir = temp_dir / 'output'
@@ -112,8 +127,7 @@ def test_stress_test(requests_mock, temp_dir, mock_civitai_responses):
     num_files = 50
     for i in range(num_files):
         file_path = models_dir / f'model_{i}.safetensors'
-        create_dummy_safetensors(file_path, size_mb=1)
-        hash_value = calculate_sha256(file_path)
+        hash_value = dummy_safetensors(file_path, size_mb=1)
         model_id = mock_civitai_responses['version']['modelId']
         requests_mock.get(f"https://civitai.com/api/v1/model-versions/by-hash/{hash_value}", json=mock_civitai_responses['version'])
         requests_mock.get(f"https://civitai.com/api/v1/models/{model_id}", json=mock_civitai_responses['model'])
@@ -138,7 +152,7 @@ def test_stress_test(requests_mock, temp_dir, mock_civitai_responses):
     processed_files = list(output_dir.glob('**/*_metadata.json'))
     assert len(processed_files) == num_files
 
-def test_memory_leak_check(requests_mock, temp_dir, mock_civitai_responses):
+def test_memory_leak_check(requests_mock, temp_dir, mock_civitai_responses, dummy_safetensors):
     """Test for memory leaks during repeated processing"""
     models_dir = temp_dir / 'models'
     output_dir = temp_dir / 'output'
@@ -147,8 +161,7 @@ def test_memory_leak_check(requests_mock, temp_dir, mock_civitai_responses):
     
     # Create test file
     test_file = models_dir / 'test_model.safetensors'
-    create_dummy_safetensors(test_file, size_mb=50)
-    hash_value = calculate_sha256(test_file)
+    hash_value = dummy_safetensors(test_file, size_mb=50)
     model_id = mock_civitai_responses['version']['modelId']
     requests_mock.get(f"https://civitai.com/api/v1/model-versions/by-hash/{hash_value}", json=mock_civitai_responses['version'])
     requests_mock.get(f"https://civitai.com/api/v1/models/{model_id}", json=mock_civitai_responses['model'])
@@ -170,12 +183,8 @@ def test_memory_leak_check(requests_mock, temp_dir, mock_civitai_responses):
         assert skipped == 0
         
         # Clear output directory
-        for file in output_dir.glob('**/*'):
-            if file.is_file():
-                file.unlink()
-        for dir in output_dir.glob('**/*'):
-            if dir.is_dir():
-                dir.rmdir()
+        shutil.rmtree(output_dir)
+        output_dir.mkdir()
 
     final_memory = process.memory_info().rss
     memory_increase = (final_memory - initial_memory) / (1024 * 1024)  # MB
@@ -5,6 +5,7 @@ from civitai_manager.src.utils.string_utils import sanitize_filename, calculate_
 from civitai_manager.src.utils.file_tracker import ProcessedFilesManager
 from civitai_manager.src.utils.process_manager import ProcessManager, ProcessStatus
 
+
 def test_sanitize_filename():
     """Test filename sanitization"""
     # Test basic sanitization
@@ -27,6 +28,7 @@ def test_sanitize_filename():
     assert sanitize_filename("тест.txt") == "_.txt"
     assert sanitize_filename("测试.txt") == "_.txt"
 
+
 def test_calculate_sha256(temp_dir):
     """Test SHA-256 hash calculation"""
     # Create test file
@@ -47,6 +49,18 @@ def test_calculate_sha256(temp_dir):
     non_existent = temp_dir / "nonexistent.txt"
     assert calculate_sha256(non_existent) is None
 
+
+def test_calculate_sha256_chunked_fallback(temp_dir, monkeypatch):
+    """Test the chunked loop used without hashlib.file_digest"""
+    import hashlib
+    test_file = temp_dir / "test.bin"
+    content = bytes(range(256)) * 1000
+    test_file.write_bytes(content)
+
+    monkeypatch.delattr(hashlib, 'file_digest', raising=False)
+    assert calculate_sha256(test_file, buffer_size=1000) == hashlib.sha256(content).hexdigest()
+
+
 def test_processed_files_manager(temp_dir):
     """Test ProcessedFilesManager functionality"""
     manager = ProcessedFilesManager(temp_dir)
@@ -78,6 +92,25 @@ def test_processed_files_manager(temp_dir):
     assert new_file in new_files
     assert test_file not in new_files
 
+    # Test bulk adding keeps one entry per path
+    new_manager.add_processed_files([test_file, new_file, new_file])
+    assert len(new_manager.processed_files['files']) == 2
+    assert new_manager.get_new_files(temp_dir) == []
+
+
+def test_processed_files_backup_ring(temp_dir):
+    """Test saves keep a fixed backup ring and drop legacy dated backups"""
+    legacy = temp_dir / 'processed_files.20240101.bak'
+    legacy.write_text('{}')
+    manager = ProcessedFilesManager(temp_dir)
+    for _ in range(manager.backup_count + 2):
+        manager.save_processed_files()
+
+    backups = sorted(p.name for p in temp_dir.glob('processed_files.*.bak'))
+    assert backups == [f'processed_files.{i}.bak' for i in range(manager.backup_count)]
+    assert not (temp_dir / 'processed_files.json.tmp').exists()
+
+
 def test_process_manager():
     """Test ProcessManager functionality"""
     manager = ProcessManager()
@@ -116,4 +149,205 @@ def test_process_manager():
         manager.add_process(f"test_{i}.safetensors")
     
     # Should only keep the most recent ones
-    assert len(manager._processes) <= 100  # Default _max_history
\ No newline at end of file
+    assert len(manager._processes) <= 100  # Default _max_history
+
+
+def test_find_preview_image(temp_dir):
+    """Test preview image lookup prefers the previews directory"""
+    from civitai_manager.src.utils.web_helpers import find_preview_image
+
+    model_dir = temp_dir / 'model'
+    model_dir.mkdir()
+    assert find_preview_image(model_dir) is None
+
+    (model_dir / 'model_preview_1.jpeg').write_bytes(b'x')
+    (model_dir / 'model_preview_0.png').write_bytes(b'x')
+    (model_dir / 'model_hash.json').write_text('{}')
+    assert find_preview_image(model_dir) == 'model_preview_0.png'
+
+    (model_dir / 'previews').mkdir()
+    (model_dir / 'previews' / 'b.webp').write_bytes(b'x')
+    (model_dir / 'previews' / 'a.JPG').write_bytes(b'x')
+    assert find_preview_image(model_dir) == 'previews/a.JPG'
+
+
+def test_load_json_file(temp_dir, monkeypatch):
+    """Test JSON files load the same below and above the mmap threshold"""
+    from civitai_manager.src.utils import string_utils
+
+    data = {'name': 'Test', 'modelVersions': [{'id': 1, 'name': 'v1'}]}
+    json_file = temp_dir / 'model.json'
+    json_file.write_text(json.dumps(data))
+    assert string_utils.load_json_file(json_file) == data
+
+    monkeypatch.setattr(string_utils, 'MMAP_THRESHOLD_BYTES', 1)
+    assert string_utils.load_json_file(json_file) == data
+
+    json_file.write_text('')
+    with pytest.raises(json.JSONDecodeError):
+        string_utils.load_json_file(json_file)
+
+
+def test_load_json_cached(temp_dir):
+    """Test cached JSON is reused until the file changes"""
+    import os
+    from civitai_manager.src.utils import web_helpers
+
+    json_file = temp_dir / 'model.json'
+    json_file.write_text(json.dumps({'name': 'Test'}))
+    first = web_helpers.load_json_cached(json_file)
+    assert web_helpers.load_json_cached(json_file) is first
+
+    json_file.write_text(json.dumps({'name': 'Changed'}))
+    st = json_file.stat()
+    os.utime(json_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert web_helpers.load_json_cached(json_file) == {'name': 'Changed'}
+
+
+def test_find_model_file_path_reuses_hash(temp_dir, mocker):
+    """Test unchanged model files are hashed only once"""
+    import os
+    from civitai_manager.src.utils import string_utils, web_helpers
+
+    model_file = temp_dir / 'sub' / 'model.safetensors'
+    model_file.parent.mkdir()
+    model_file.write_bytes(b'weights')
+    sha = mocker.patch.object(string_utils, 'calculate_sha256', return_value='abc')
+
+    assert web_helpers.find_model_file_path(str(temp_dir), 'abc', 'model.safetensors') == os.path.join('sub', 'model.safetensors')
+    assert web_helpers.find_model_file_path(str(temp_dir), 'abc', 'model.safetensors') is not None
+    assert sha.call_count == 1
+
+    st = model_file.stat()
+    os.utime(model_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    web_helpers.find_model_file_path(str(temp_dir), 'abc', 'model.safetensors')
+    assert sha.call_count == 2
+
+
+def test_find_model_file_path_with_index(temp_dir, mocker):
+    """Test model files are resolved from a prebuilt name index"""
+    import os
+    from civitai_manager.src.utils import string_utils, web_helpers
+
+    (temp_dir / 'a').mkdir()
+    (temp_dir / 'b').mkdir()
+    (temp_dir / 'a' / 'model.safetensors').write_bytes(b'first')
+    (temp_dir / 'b' / 'model.safetensors').write_bytes(b'second')
+    (temp_dir / 'b' / 'notes.txt').write_text('not a model')
+
+    index = web_helpers.index_model_files(str(temp_dir))
+    assert sorted(index) == ['model.safetensors']
+    assert len(index['model.safetensors']) == 2
+
+    mocker.patch.object(string_utils, 'calculate_sha256',
+                        side_effect=lambda path: 'match' if path.endswith(os.path.join('b', 'model.safetensors')) else 'other')
+    walk = mocker.spy(web_helpers, '_iter_named_files')
+    assert web_helpers.find_model_file_path(str(temp_dir), 'match', 'model.safetensors',
+                                            file_index=index) == os.path.join('b', 'model.safetensors')
+    assert web_helpers.find_model_file_path(str(temp_dir), 'match', 'missing.safetensors', file_index=index) is None
+    walk.assert_not_called()
+
+
+def test_cached_sha256_is_bounded(temp_dir, mocker):
+    """Test the hash memo evicts the least recently hashed file"""
+    from civitai_manager.src.utils import string_utils
+
+    mocker.patch.object(string_utils, 'FILE_HASH_CACHE_SIZE', 1)
+    sha = mocker.patch.object(string_utils, 'calculate_sha256', return_value='abc')
+    first, second = temp_dir / 'first.safetensors', temp_dir / 'second.safetensors'
+    first.write_bytes(b'1')
+    second.write_bytes(b'2')
+
+    string_utils.cached_sha256(first)
+    string_utils.cached_sha256(second)
+    assert len(string_utils._file_hash_cache) == 1
+    string_utils.cached_sha256(first)
+    assert sha.call_count == 3
+
+
+def test_dump_json_file(temp_dir):
+    """Test JSON written by dump_json_file loads back unchanged"""
+    from civitai_manager.src.utils import string_utils
+
+    data = {'models_directory': '/data/models', 'user_posts_limit': 0, 'nested': {'a': [1, 2]}}
+    json_file = temp_dir / 'config.json'
+    string_utils.dump_json_file(json_file, data, indent=True)
+    assert json.loads(json_file.read_text()) == data
+    assert '\n  "models_directory"' in json_file.read_text()
+
+    string_utils.dump_json_file(json_file, data)
+    assert json.loads(json_file.read_text()) == data
+
+
+def test_iter_model_files(temp_dir):
+    """Test model files are found recursively, skipping other files and broken links"""
+    import os
+    from civitai_manager.src.utils.file_tracker import iter_model_files
+
+    (temp_dir / 'loras' / 'style').mkdir(parents=True)
+    (temp_dir / 'base.safetensors').write_bytes(b'x')
+    (temp_dir / 'loras' / 'style' / 'Detail.CKPT').write_bytes(b'x')
+    (temp_dir / 'loras' / 'readme.txt').write_text('not a model')
+    os.symlink(temp_dir / 'missing.safetensors', temp_dir / 'broken.safetensors')
+
+    found = sorted(os.path.relpath(p, temp_dir) for p in iter_model_files(temp_dir))
+    assert found == ['base.safetensors', os.path.join('loras', 'style', 'Detail.CKPT')]
+
+
+def test_model_file_walks_follow_symlinked_dirs(temp_dir):
+    """Test the scanners and the name search all follow symlinked directories once"""
+    import os
+    from civitai_manager.src.utils import web_helpers
+    from civitai_manager.src.utils.file_tracker import iter_model_files
+
+    (temp_dir / 'external').mkdir()
+    (temp_dir / 'external' / 'linked.safetensors').write_bytes(b'x')
+    (temp_dir / 'models').mkdir()
+    os.symlink(temp_dir / 'external', temp_dir / 'models' / 'shared')
+    os.symlink(temp_dir / 'models', temp_dir / 'models' / 'loop')
+
+    expected = os.path.join(temp_dir, 'models', 'shared', 'linked.safetensors')
+    assert expected in list(iter_model_files(temp_dir / 'models'))
+    assert expected in web_helpers.index_model_files(str(temp_dir / 'models'))['linked.safetensors']
+    assert expected in list(web_helpers._iter_named_files(str(temp_dir / 'models'), 'linked.safetensors'))
+    assert list(iter_model_files(temp_dir / 'models', follow_symlinks=False)) == []
+
+
+def test_list_previews(temp_dir):
+    """Test previews are grouped by extension and sorted within each group"""
+    from civitai_manager.src.utils.html_generators.model_page import _list_previews
+
+    for name in ['m_preview_1.png', 'm_preview_0.mp4', 'm_preview_1.jpg',
+                 'm_preview_0.jpg', 'm_preview_0.jpeg', 'm_preview_0.json',
+                 'other_preview_0.jpg']:
+        (temp_dir / name).write_bytes(b'x')
+
+    assert [p.name for p in _list_previews(temp_dir, 'm')] == [
+        'm_preview_0.jpg', 'm_preview_1.jpg', 'm_preview_0.jpeg',
+        'm_preview_1.png', 'm_preview_0.mp4']
+    assert _list_previews(temp_dir / 'previews', 'm') == []
+
+
+def test_process_manager_evicts_oldest_finished_first():
+    """Test history trimming drops finished processes before active ones"""
+    manager = ProcessManager()
+    manager._max_history = 3
+
+    for name in ('a', 'b', 'c'):
+        manager.add_process(name)
+    manager.update_status('b', 'completed')
+    manager.add_process('d')
+
+    assert list(manager._processes) == ['a', 'c', 'd']
+    manager.add_process('e')
+    assert list(manager._processes) == ['c', 'd', 'e']
+
+
+def test_check_directory_access_rejects_invalid_paths(temp_dir):
+    """Test check_directory_access answers False instead of raising"""
+    from civitai_manager.src.utils.security import check_directory_access
+
+    assert check_directory_access(str(temp_dir), require_write=True)
+    assert not check_directory_access(str(temp_dir / 'missing'))
+    assert not check_directory_access(None)
+    assert not check_directory_access(str(temp_dir) + '\0x')
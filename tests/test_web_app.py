@@ -119,6 +119,21 @@ def test_process_status_api(client):
     response = client.get('/api/process-status/nonexistent')
     assert response.status_code == 404
 
+def test_process_status_batch_api(client):
+    """Test several process statuses are returned from one request"""
+    from civitai_manager.web_app import process_mgr
+    process_id = process_mgr.add_process("batch.safetensors")
+
+    response = client.get(f'/api/process-status?id={process_id}&id=nonexistent')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data[process_id]['filename'] == "batch.safetensors"
+    assert data['nonexistent'] is None
+
+    too_many = '&'.join(f'id={i}' for i in range(101))
+    response = client.get(f'/api/process-status?{too_many}')
+    assert response.status_code == 400
+
 def test_model_detail_page(client, test_config, mocker):
     """Test model detail page"""
     # Explicitly set app config for this test
@@ -156,4 +171,635 @@ def test_model_detail_page(client, test_config, mocker):
     response = client.get(f'/model/{model_name}')
     assert response.status_code == 200
     assert b'Test Model' in response.data
-    assert b'Test description' in response.data
\ No newline at end of file
+    assert b'Test description' in response.data
+
+def test_local_static_uses_server_file_wrapper(client):
+    """Test static files are handed to the server's wsgi.file_wrapper"""
+    image = Path(app.config['OUTPUT_DIR']) / 'model' / 'preview.jpeg'
+    image.parent.mkdir()
+    image.write_bytes(b'x' * 1024)
+
+    wrapped = []
+
+    def file_wrapper(fh, blksize=8192):
+        wrapped.append(fh.name)
+        return iter(lambda: fh.read(blksize), b'')
+
+    response = client.get('/local_static/model/preview.jpeg',
+                          environ_overrides={'wsgi.file_wrapper': file_wrapper})
+    assert response.status_code == 200
+    assert response.data == b'x' * 1024
+    assert wrapped == [str(image)]
+    assert response.content_length == 1024
+
+    assert client.get('/local_static/model/missing.jpeg').status_code == 404
+
+def test_local_static_json_keeps_file_wrapper(client):
+    """Test JSON files without a .gz sibling are not buffered for compression"""
+    metadata = Path(app.config['OUTPUT_DIR']) / 'model' / 'model_civitai_model.json'
+    metadata.parent.mkdir()
+    metadata.write_text(json.dumps({'name': 'x' * 2048}))
+
+    wrapped = []
+
+    def file_wrapper(fh, blksize=8192):
+        wrapped.append(fh.name)
+        return iter(lambda: fh.read(blksize), b'')
+
+    response = client.get('/local_static/model/model_civitai_model.json',
+                          headers={'Accept-Encoding': 'gzip, br'},
+                          environ_overrides={'wsgi.file_wrapper': file_wrapper})
+    assert response.status_code == 200
+    assert wrapped == [str(metadata)]
+    assert 'Content-Encoding' not in response.headers
+    assert response.content_length == metadata.stat().st_size
+
+def test_local_static_fallback_buffer_size(client):
+    """Test the generic file wrapper reads in STATIC_BLKSIZE chunks"""
+    image = Path(app.config['OUTPUT_DIR']) / 'model' / 'preview.jpeg'
+    image.parent.mkdir()
+    image.write_bytes(b'x' * (300 * 1024))
+
+    response = client.get('/local_static/model/preview.jpeg', buffered=False)
+    chunks = [len(chunk) for chunk in response.response]
+    response.close()
+    assert chunks[0] == app.config['STATIC_BLKSIZE']
+    assert sum(chunks) == 300 * 1024
+
+def test_models_info_cached_until_summary_changes(client):
+    """Test get_models_info reuses its result until the summary file changes"""
+    from civitai_manager.web_app import get_models_info
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    (output_dir / 'model').mkdir()
+    (output_dir / 'model' / 'model_preview_0.jpeg').write_bytes(b'x')
+    summary = output_dir / 'all_models_summary.json'
+    summary.write_text(json.dumps([{'base_name': 'model', 'name': 'Model', 'type': 'LORA'}]))
+
+    with app.test_request_context():
+        first = get_models_info()
+        assert first[0][0]['preview_image_url'].endswith('model/model_preview_0.jpeg')
+        assert get_models_info() is first
+
+        summary.write_text(json.dumps([{'base_name': 'model', 'name': 'Renamed', 'type': 'LORA'}]))
+        stat = summary.stat()
+        os.utime(summary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = get_models_info()
+        assert second is not first
+        assert second[0][0]['title'] == 'Renamed'
+
+def test_models_info_does_not_escape_summary_twice(client):
+    """Test names escaped by generate_global_summary render escaped once"""
+    from markupsafe import escape
+    from civitai_manager.web_app import get_models_info
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    summary = output_dir / 'all_models_summary.json'
+    summary.write_text(json.dumps([{'base_name': 'model', 'name': 'A &amp; B',
+                                    'tags': ['&lt;tag&gt;'], 'type': 'LORA'}]))
+
+    with app.test_request_context():
+        model = get_models_info()[0][0]
+    assert str(escape(model['title'])) == 'A &amp; B'
+    assert str(escape(model['tags'][0])) == '&lt;tag&gt;'
+    assert str(escape(model['author'])) == 'Unknown'
+
+def test_models_info_reloads_cooked_summary(client, mocker):
+    """Test the post-processed dashboard list is reused from _cache after a restart"""
+    from civitai_manager import web_app
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    summary = output_dir / 'all_models_summary.json'
+    summary.write_text(json.dumps([{'base_name': 'model', 'name': 'Model', 'type': 'LORA',
+                                    'preview_filename': 'model_preview_0.jpeg'}]))
+
+    with app.test_request_context():
+        first = web_app.get_models_info()
+        assert (output_dir / '_cache' / 'models_info.json').exists()
+
+        web_app._MODELS_INFO_CACHE.clear()
+        preview = mocker.patch('civitai_manager.web_app._find_preview_image')
+        models, counts, _ = web_app.get_models_info()
+        preview.assert_not_called()
+        assert models == first[0]
+        assert counts == {'LORA': 1}
+
+def test_models_info_cooked_summary_tracks_non_summary_inputs(client):
+    """Test the reloaded list follows the script root and version file edits"""
+    from civitai_manager import web_app
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    (output_dir / 'model').mkdir()
+    version_file = output_dir / 'model' / 'model_civitai_model_version.json'
+    version_file.write_text(json.dumps({'name': 'v1'}))
+    summary = output_dir / 'all_models_summary.json'
+    summary.write_text(json.dumps([{'base_name': 'model', 'name': 'Model', 'type': 'LORA',
+                                    'preview_filename': 'model_preview_0.jpeg'}]))
+
+    with app.test_request_context():
+        assert web_app.get_models_info()[0][0]['versions'] == [{'name': 'v1'}]
+
+    version_file.write_text(json.dumps({'name': 'v2'}))
+    stat = version_file.stat()
+    os.utime(version_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    web_app._MODELS_INFO_CACHE.clear()
+    with app.test_request_context(base_url='http://localhost/archive/'):
+        model = web_app.get_models_info()[0][0]
+    assert model['versions'] == [{'name': 'v2'}]
+    assert model['preview_image_url'].startswith('/archive/')
+
+    # A damaged cache file is rebuilt from the summary instead of raising
+    cache_file = output_dir / '_cache' / 'models_info.json'
+    data = json.loads(cache_file.read_text())
+    del data['type_counts']
+    cache_file.write_text(json.dumps(data))
+    web_app._MODELS_INFO_CACHE.clear()
+    with app.test_request_context():
+        assert web_app.get_models_info()[1] == {'LORA': 1}
+
+def test_schedule_summary_coalesces_rebuilds(mocker):
+    """Test rapid summary requests lead to a single delayed rebuild"""
+    import threading
+    from civitai_manager import web_app
+
+    done = threading.Event()
+    rebuild = mocker.patch('civitai_manager.web_app.generate_global_summary',
+                           side_effect=lambda *args: done.set())
+    mocker.patch.object(web_app, 'SUMMARY_REBUILD_DELAY', 0.1)
+
+    for _ in range(3):
+        web_app._schedule_summary('/output', '/models')
+    assert done.wait(5)
+    web_app._summary_timer.join(5)
+    rebuild.assert_called_once_with(Path('/output'), Path('/models'))
+
+def test_coalesced_shares_concurrent_calls():
+    """Test concurrent callers with the same key share one computation"""
+    import threading
+    from civitai_manager.web_app import _coalesced
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'loaded': True}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(_coalesced('key', load)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(_coalesced('key', load)))
+    second.start()
+    second.join(0.2)  # let the second caller reach the in-flight future
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(calls) == 1
+    assert results[0] is results[1]
+    # Later calls compute again
+    _coalesced('key', load)
+    assert len(calls) == 2
+
+def test_model_detail_rejects_parent_directory(client, test_config, mocker):
+    """Test the model page does not resolve names outside the output directory"""
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+
+    response = client.get('/model/..')
+    assert response.status_code == 404
+
+def test_model_detail_resolves_preview_images(client, test_config, mocker):
+    """Test preview images resolve to previews/, the legacy root or a placeholder"""
+    model_name = 'test_model'
+    model_dir = Path(test_config['output_directory']) / model_name
+    (model_dir / 'previews').mkdir(parents=True)
+    (model_dir / 'previews' / f'{model_name}_preview_0.jpeg').write_bytes(b'x')
+    (model_dir / f'{model_name}_preview_1.png').write_bytes(b'x')
+    images = [{'url': 'https://example.com/a.jpeg?w=1'},
+              {'url': 'https://example.com/b.png'},
+              {'url': 'https://example.com/c.jpeg'}]
+    with open(model_dir / f"{model_name}_civitai_model_version.json", 'w') as f:
+        json.dump({"name": "v1.0", "images": images}, f)
+
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+
+    response = client.get(f'/model/{model_name}')
+    assert response.status_code == 200
+    assert f'/local_static/{model_name}/previews/{model_name}_preview_0.jpeg'.encode() in response.data
+    assert f'/local_static/{model_name}/{model_name}_preview_1.png'.encode() in response.data
+    assert f'{model_name}_preview_2'.encode() not in response.data
+
+def test_model_detail_cached_until_files_change(client, test_config, mocker):
+    """Test model_detail reuses loaded data until one of its files changes"""
+    from civitai_manager import web_app
+
+    model_name = 'test_model'
+    model_dir = Path(test_config['output_directory']) / model_name
+    model_dir.mkdir(parents=True)
+    version_file = model_dir / f"{model_name}_civitai_model_version.json"
+    version_file.write_text(json.dumps({"name": "v1.0"}))
+
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    loader = mocker.spy(web_app, '_load_model_detail')
+
+    assert b'v1.0' in client.get(f'/model/{model_name}').data
+    assert b'v1.0' in client.get(f'/model/{model_name}').data
+    assert loader.call_count == 1
+
+    version_file.write_text(json.dumps({"name": "v2.0"}))
+    stat = version_file.stat()
+    os.utime(version_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert b'v2.0' in client.get(f'/model/{model_name}').data
+    assert loader.call_count == 2
+
+def test_model_detail_lists_user_posts(client, test_config, mocker):
+    """Test downloaded user posts are listed with their media and sidecar metadata"""
+    model_name = 'test_model'
+    model_dir = Path(test_config['output_directory']) / model_name
+    post_dir = model_dir / 'user_posts' / 'post_42'
+    post_dir.mkdir(parents=True)
+    (post_dir / 'post.json').write_text(json.dumps({'postId': 42}))
+    (post_dir / 'image_1.jpeg').write_bytes(b'x')
+    (post_dir / 'image_1.json').write_text(json.dumps({'meta': {'prompt': 'a lighthouse'}}))
+    (post_dir / 'notes.txt').write_text('ignored')
+    with open(model_dir / f"{model_name}_civitai_model_version.json", 'w') as f:
+        json.dump({"name": "v1.0"}, f)
+
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+
+    response = client.get(f'/model/{model_name}')
+    assert response.status_code == 200
+    assert f'/local_static/{model_name}/user_posts/post_42/image_1.jpeg'.encode() in response.data
+    assert b'a lighthouse' in response.data
+    assert b'notes.txt' not in response.data
+
+def test_model_detail_reloads_rewritten_post_sidecar(client, test_config, mocker):
+    """Test rewriting a post's sidecar in place invalidates the cached detail"""
+    model_name = 'test_model'
+    model_dir = Path(test_config['output_directory']) / model_name
+    post_dir = model_dir / 'user_posts' / 'post_42'
+    post_dir.mkdir(parents=True)
+    (post_dir / 'image_1.jpeg').write_bytes(b'x')
+    sidecar = post_dir / 'image_1.json'
+    sidecar.write_text(json.dumps({'meta': {'prompt': 'a lighthouse'}}))
+
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+
+    assert b'a lighthouse' in client.get(f'/model/{model_name}').data
+    dir_stat = post_dir.stat()
+    sidecar.write_text(json.dumps({'meta': {'prompt': 'a windmill'}}))
+    stat = sidecar.stat()
+    os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    os.utime(post_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+    assert b'a windmill' in client.get(f'/model/{model_name}').data
+
+def test_cached_pages_follow_script_root(client, test_config, mocker):
+    """Test cached listing and detail data get the current request's URL prefix"""
+    from civitai_manager import web_app
+
+    model_name = 'test_model'
+    model_dir = Path(test_config['output_directory']) / model_name
+    post_dir = model_dir / 'user_posts' / 'post_42'
+    post_dir.mkdir(parents=True)
+    (post_dir / 'image_1.jpeg').write_bytes(b'x')
+    (model_dir / f'{model_name}_preview_0.jpeg').write_bytes(b'x')
+    with open(model_dir / f"{model_name}_civitai_model_version.json", 'w') as f:
+        json.dump({"name": "v1.0", "images": [{'url': 'https://example.com/a.jpeg'}]}, f)
+
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    loader = mocker.spy(web_app, '_load_model_detail')
+
+    with app.test_request_context():
+        assert web_app.get_models_info()[0][0]['preview_image_url'].startswith('/local_static/')
+    with app.test_request_context(base_url='http://localhost/archive/'):
+        assert web_app.get_models_info()[0][0]['preview_image_url'].startswith('/archive/local_static/')
+
+    assert b'"/local_static/test_model/test_model_preview_0.jpeg"' in client.get(f'/model/{model_name}').data
+    response = client.get(f'/model/{model_name}', base_url='http://localhost/archive/')
+    assert loader.call_count == 1
+    assert b'"/local_static/' not in response.data
+    assert f'/archive/local_static/{model_name}/{model_name}_preview_0.jpeg'.encode() in response.data
+    assert f'/archive/local_static/{model_name}/user_posts/post_42/image_1.jpeg'.encode() in response.data
+
+def test_local_models_accel_redirect(client, test_config, mocker):
+    """Test model downloads are handed to nginx when MODELS_ACCEL_PREFIX is set"""
+    models_dir = Path(test_config['models_directory'])
+    (models_dir / 'my model.safetensors').write_bytes(b'weights')
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    mocker.patch.dict(app.config, {'MODELS_ACCEL_PREFIX': '/_models/'})
+
+    response = client.get('/local_models/my model.safetensors')
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == '/_models/my%20model.safetensors'
+    assert response.data == b''
+
+    assert client.get('/local_models/missing.safetensors').status_code == 404
+    assert client.get('/local_models/../config.json').status_code == 404
+
+def test_local_static_x_sendfile(client, mocker):
+    """Test local files are left to the front server when X-Sendfile is on"""
+    preview = Path(app.config['OUTPUT_DIR']) / 'preview.jpeg'
+    preview.write_bytes(b'jpeg')
+    mocker.patch.dict(app.config, {'USE_X_SENDFILE': True})
+
+    response = client.get('/local_static/preview.jpeg')
+    assert response.status_code == 200
+    assert response.headers['X-Sendfile'] == str(preview)
+    assert response.data == b''
+    assert 'max-age' in response.headers['Cache-Control']
+
+def test_local_static_serves_precompressed_json(client):
+    """Test JSON files with a fresh .gz sibling are sent gzip-encoded"""
+    import gzip
+    summary = Path(app.config['OUTPUT_DIR']) / 'all_models_summary.json'
+    summary.write_text('[]')
+    with gzip.open(f'{summary}.gz', 'wb') as f:
+        f.write(b'[]')
+
+    response = client.get('/local_static/all_models_summary.json',
+                          headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'application/json'
+    assert gzip.decompress(response.data) == b'[]'
+    assert 'Accept-Encoding' in response.vary
+
+    response = client.get('/local_static/all_models_summary.json')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'[]'
+    assert 'Accept-Encoding' in response.vary
+
+def test_local_static_cache_headers(client):
+    """Test static files are cacheable and revalidate with a 304"""
+    image = Path(app.config['OUTPUT_DIR']) / 'model' / 'preview.jpeg'
+    image.parent.mkdir()
+    image.write_bytes(b'x' * 16)
+
+    response = client.get('/local_static/model/preview.jpeg')
+    assert response.cache_control.public
+    assert response.cache_control.max_age == app.config['LOCAL_STATIC_MAX_AGE']
+    assert response.headers['ETag'] and response.headers['Last-Modified']
+
+    response = client.get('/local_static/model/preview.jpeg',
+                          headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+def test_save_upload(tmp_path):
+    """Test uploads are copied intact from spooled and in-memory streams"""
+    import io
+    import tempfile
+    from werkzeug.datastructures import FileStorage
+    from civitai_manager.web_app import _save_upload
+
+    payload = os.urandom(3 * 1024 * 1024 + 7)
+
+    spooled = tempfile.TemporaryFile()
+    spooled.write(payload)
+    spooled.seek(0)
+    _save_upload(FileStorage(spooled, 'a.safetensors'), tmp_path / 'a.safetensors')
+    assert (tmp_path / 'a.safetensors').read_bytes() == payload
+
+    _save_upload(FileStorage(io.BytesIO(payload), 'b.safetensors'), tmp_path / 'b.safetensors')
+    assert (tmp_path / 'b.safetensors').read_bytes() == payload
+
+def test_upload_rejected_when_queue_full(client, test_config, mocker):
+    """Test uploads get a 503 instead of queueing without bound"""
+    import io
+    from civitai_manager import web_app
+
+    mocker.patch.dict(app.config, {'WTF_CSRF_ENABLED': False})
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch.object(web_app.process_mgr, 'pending_count', return_value=web_app.MAX_QUEUED_UPLOADS)
+    save = mocker.patch('civitai_manager.web_app._save_upload')
+
+    response = client.post('/upload', data={'model_file': (io.BytesIO(b'x'), 'model.safetensors')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+    save.assert_not_called()
+
+def test_upload_queue_limit_with_busy_worker(client, test_config, mocker):
+    """Test uploads queue behind a busy worker up to MAX_QUEUED_UPLOADS, then get a 503"""
+    import io
+    import threading
+    import time
+    from civitai_manager import web_app
+    from civitai_manager.src.utils.process_manager import ProcessManager
+
+    mocker.patch.dict(app.config, {'WTF_CSRF_ENABLED': False})
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    mocker.patch('civitai_manager.web_app._save_upload')
+    process = mocker.patch('civitai_manager.src.core.metadata_manager.process_single_file', return_value=False)
+    mocker.patch.object(web_app, 'MAX_QUEUED_UPLOADS', 2)
+    manager = ProcessManager()
+    mocker.patch.object(web_app, 'process_mgr', manager)
+
+    started, release = threading.Event(), threading.Event()
+    manager.queue_process(lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+    try:
+        codes = [client.post('/upload', data={'model_file': (io.BytesIO(b'x'), f'model{i}.safetensors')},
+                             content_type='multipart/form-data').status_code
+                 for i in range(3)]
+        assert codes == [200, 200, 503]
+        assert manager.pending_count() == 2
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while process.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert process.call_count == 2
+    assert manager.pending_count() == 0
+
+def test_direct_scan_reuses_model_file_index(client, mocker):
+    """Test the direct scan resolves each model file once and persists it"""
+    from civitai_manager import web_app
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    models_dir = Path(app.config['MODELS_DIR'])
+    (models_dir / 'model.safetensors').write_bytes(b'x')
+    (output_dir / 'model').mkdir()
+    (output_dir / 'model' / 'model_hash.json').write_text(
+        json.dumps({'hash_value': 'abc', 'name': 'model.safetensors'}))
+    finder = mocker.patch('civitai_manager.web_app.find_model_file_path',
+                          return_value='model.safetensors')
+
+    with app.test_request_context():
+        assert web_app.get_models_info()[0][0]['files'] == ['model.safetensors']
+        assert web_app.get_models_info()[0][0]['files'] == ['model.safetensors']
+    assert finder.call_count == 1
+    assert (output_dir / '_cache' / 'model_files.json').exists()
+
+def test_direct_scan_merges_model_file_index(client, mocker):
+    """Test scan workers leave the shared index alone and the request merges it"""
+    from civitai_manager import web_app
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    (output_dir / 'model').mkdir()
+    (output_dir / 'model' / 'model_hash.json').write_text(
+        json.dumps({'hash_value': 'abc', 'name': 'model.safetensors'}))
+    (output_dir / 'gone').mkdir()
+    mocker.patch('civitai_manager.web_app.find_model_file_path', return_value='model.safetensors')
+    stale = {'hash_mtime_ns': 1, 'rel_path': 'gone.safetensors'}
+    with web_app._MODEL_FILES_INDEX_LOCK:
+        index = web_app._model_files_index(str(output_dir))
+        index['gone'] = stale
+
+    assert web_app._resolve_model_file(stale, app.config['MODELS_DIR'],
+                                       str(output_dir / 'gone' / 'gone_hash.json')) == (None, None)
+    assert index['gone'] is stale
+
+    with app.test_request_context():
+        web_app.get_models_info()
+    saved = json.loads((output_dir / '_cache' / 'model_files.json').read_text())
+    assert saved['model']['rel_path'] == 'model.safetensors'
+    assert 'gone' not in saved
+
+def test_api_refresh_drops_listing_cache(client, test_config, mocker):
+    """Test /api/refresh makes the next request rebuild the model listing"""
+    from civitai_manager import web_app
+
+    mocker.patch.dict(app.config, {'WTF_CSRF_ENABLED': False})
+    mocker.patch('civitai_manager.web_app.load_web_config', return_value=test_config)
+    output_dir = Path(test_config['output_directory'])
+    (output_dir / 'm1').mkdir()
+
+    # Direct scan
+    with app.test_request_context():
+        first = web_app.get_models_info()
+        assert web_app.get_models_info() is first
+
+    response = client.post('/api/refresh')
+    assert response.status_code == 200
+
+    with app.test_request_context():
+        assert web_app.get_models_info() is not first
+
+    # Summary path, including the cooked listing in _cache
+    version_file = output_dir / 'm1' / 'm1_civitai_model_version.json'
+    version_file.write_text(json.dumps({'name': 'v1'}))
+    (output_dir / 'all_models_summary.json').write_text(
+        json.dumps([{'base_name': 'm1', 'name': 'M1', 'type': 'LORA'}]))
+
+    with app.test_request_context():
+        assert web_app.get_models_info()[0][0]['versions'] == [{'name': 'v1'}]
+
+    version_file.write_text(json.dumps({'name': 'v2'}))
+    stat = version_file.stat()
+    os.utime(version_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    response = client.post('/api/refresh')
+    assert response.status_code == 200
+    assert not (output_dir / '_cache' / 'models_info.json').exists()
+
+    with app.test_request_context():
+        assert web_app.get_models_info()[0][0]['versions'] == [{'name': 'v2'}]
+
+def test_api_models_reuses_serialized_body(client, mocker):
+    """Test /api/models serializes an unchanged listing only once"""
+    result = ([{'name': 'model', 'title': 'Model'}], {'LORA': 1}, 0.5)
+    mocker.patch('civitai_manager.web_app.get_models_info', return_value=result)
+    dumps = mocker.spy(app.json, 'dumps')
+
+    first = client.get('/api/models')
+    second = client.get('/api/models')
+    assert first.get_json() == [[{'name': 'model', 'title': 'Model'}], {'LORA': 1}, 0.5]
+    assert second.data == first.data
+    # The session cookie goes through app.json too; count only the listing
+    assert [c.args[0] for c in dumps.call_args_list].count(result) == 1
+
+def test_api_models_not_modified(client, mocker):
+    """Test /api/models answers 304 to a matching If-None-Match"""
+    result = ([{'name': 'model'}], {}, 0)
+    mocker.patch('civitai_manager.web_app.get_models_info', return_value=result)
+
+    first = client.get('/api/models')
+    assert first.headers['ETag']
+    assert 'no-cache' in first.headers['Cache-Control']
+
+    second = client.get('/api/models', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.data == b''
+
+def test_api_models_compressed_not_modified(client, mocker):
+    """Test compressed /api/models bodies revalidate with their encoded ETag"""
+    import gzip
+    result = ([{'name': f'model-{i}', 'tags': ['style', 'character']} for i in range(50)], {}, 0)
+    mocker.patch('civitai_manager.web_app.get_models_info', return_value=result)
+    flask_compress = pytest.importorskip('flask_compress.flask_compress')
+    compress = mocker.spy(flask_compress, '_compress_data')
+
+    first = client.get('/api/models', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert first.headers['ETag'].endswith(':gzip"')
+    assert json.loads(gzip.decompress(first.data))[0][0]['name'] == 'model-0'
+
+    second = client.get('/api/models', headers={'Accept-Encoding': 'gzip',
+                                                'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert compress.call_count == 1
+
+def test_direct_scan_cached_until_output_dir_changes(client, mocker):
+    """Test the direct scan is reused until a model directory is added"""
+    from civitai_manager import web_app
+
+    output_dir = Path(app.config['OUTPUT_DIR'])
+    (output_dir / 'first').mkdir()
+
+    with app.test_request_context():
+        first = web_app.get_models_info()
+        assert web_app.get_models_info() is first
+
+        (output_dir / 'second').mkdir()
+        second = web_app.get_models_info()
+        assert sorted(m['name'] for m in second[0]) == ['first', 'second']
+
+        mocker.patch.object(web_app, 'DIRECT_SCAN_TTL', 0)
+        assert web_app.get_models_info() is not second
+
+def test_allowed_file():
+    """Test upload names are matched on the model file extension"""
+    from civitai_manager.web_app import allowed_file
+    assert allowed_file('model.safetensors')
+    assert allowed_file('Model.V2.CKPT')
+    assert not allowed_file('safetensors')
+    assert not allowed_file('model.safetensors.txt')
+
+def test_run_server_falls_back_to_threaded_dev_server(mocker, monkeypatch):
+    """Test run_server uses the threaded Werkzeug server without waitress"""
+    import sys
+    from civitai_manager import web_app
+
+    monkeypatch.setitem(sys.modules, 'waitress', None)
+    run = mocker.patch.object(web_app.app, 'run')
+    web_app.run_server(host='127.0.0.1', port=8080)
+    run.assert_called_once_with(host='127.0.0.1', port=8080, debug=False, threaded=True)
+
+def test_process_all_requires_post_with_csrf(client, mocker):
+    """Test processing can only be started by a POST carrying a CSRF token"""
+    import re
+    mocker.patch.dict(app.config, {'WTF_CSRF_ENABLED': True})
+    mocker.patch('civitai_manager.web_app.is_configured', return_value=True)
+    submit = mocker.patch('civitai_manager.web_app.processing_executor.submit')
+
+    assert client.get('/process-all').status_code == 405
+    assert client.post('/process-all').status_code == 400
+    submit.assert_not_called()
+
+    page = client.get('/settings').get_data(as_text=True)
+    token = re.search(r'<meta name="csrf-token" content="([^"]+)"', page).group(1)
+    response = client.post('/process-all', headers={'X-CSRFToken': token})
+    assert response.status_code == 200
+    submit.assert_called_once()